@@ -0,0 +1,75 @@
+"""
+Microbenchmark: per-entry HTML processing in NewsFetcherService.
+
+Compares the previous approach (two BeautifulSoup parses per entry: one for text, one for
+the <img> lookup) against the single streaming pass in NewsFetcherService._parse_summary,
+on the feed fixtures in benchmarks/fixtures. Outputs of both paths are checked for equality.
+
+The bundled fixture (ai_blog_feed.xml) is synthetic: hand-written entries modelled on vendor
+AI blog feeds, not a captured feed. To measure on real data, save feeds into
+benchmarks/fixtures as *.xml; every file there is replayed.
+
+Usage:
+    uv run python -m benchmarks.html_parsing --repeat 20
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import feedparser
+from bs4 import BeautifulSoup
+
+from src.content_agents.services.news_fetcher import NewsFetcherService
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+def legacy_process(entry: dict) -> tuple[str, str | None]:
+    """The pre-optimization code path, kept here for comparison."""
+    html_content = entry.get("summary", "") or entry.get("description", "")
+    text = BeautifulSoup(html_content, "html.parser").get_text(separator="\n").strip() if html_content else ""
+
+    image_url = None
+    if "summary" in entry:
+        img = BeautifulSoup(entry["summary"], "html.parser").find("img")
+        if img and img.get("src"):
+            image_url = img["src"]
+    return text, image_url
+
+
+def single_pass_process(service: NewsFetcherService, entry: dict) -> tuple[str, str | None]:
+    text, summary_image = service._parse_summary(entry.get("summary", "") or entry.get("description", ""))
+    return text, service._extract_image(entry, summary_image)
+
+
+def measure(label: str, entries: list[dict], process: Callable[[dict], tuple[str, str | None]], repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for entry in entries:
+            process(entry)
+    elapsed = time.perf_counter() - started
+    throughput = len(entries) * repeat / elapsed
+    print(f"{label:<28}{throughput:>12.0f} entries/s")
+    return throughput
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Entry HTML processing throughput")
+    parser.add_argument("--repeat", type=int, default=20, help="Passes over the fixture entries")
+    repeat = parser.parse_args().repeat
+
+    entries = [entry for path in sorted(FIXTURES_DIR.glob("*.xml")) for entry in feedparser.parse(path.read_bytes()).entries]
+    service = NewsFetcherService()
+
+    mismatches = sum(legacy_process(e) != single_pass_process(service, e) for e in entries)
+    print(f"Fixture entries: {len(entries)}, output mismatches: {mismatches}\n")
+
+    legacy = measure("legacy (2x html.parser)", entries, legacy_process, repeat)
+    current = measure("single pass (streaming)", entries, lambda e: single_pass_process(service, e), repeat)
+    print(f"\nSpeedup: {current / legacy:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
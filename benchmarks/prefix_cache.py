@@ -0,0 +1,111 @@
+"""
+Offline benchmark: how many prefill tokens vLLM's automatic prefix caching can reuse in one session.
+
+Simulates a session of writer/critic rounds with the real prompt builders and, for every call,
+measures the longest prefix shared with any earlier prompt (what the KV cache can serve).
+Token counts use the same chars/4 estimate as the prompt budgeting; an image counts as a fixed
+number of tokens (Gemma 3 encodes every image as 256 soft tokens).
+
+Usage:
+    uv run python -m benchmarks.prefix_cache --rounds 3
+"""
+
+import argparse
+
+from langchain_core.messages import BaseMessage
+
+from src.content_agents.agents import critic, writer
+from src.content_agents.core.utils import estimate_tokens
+from src.content_agents.schemas.data_types import Critique, NewsArticle, TweetDraft
+
+IMAGE_TOKENS = 256
+IMAGE_PLACEHOLDER = "\x00" * IMAGE_TOKENS * 4
+
+
+def render(messages: list[BaseMessage]) -> str:
+    """Flatten messages roughly the way a chat template does, keeping block order."""
+    parts = []
+    for message in messages:
+        parts.append(f"<{message.type}>")
+        blocks = message.content if isinstance(message.content, list) else [message.content]
+        for block in blocks:
+            if isinstance(block, str):
+                parts.append(block)
+            elif block.get("type") == "image_url":
+                parts.append(block["image_url"]["url"][:64] + IMAGE_PLACEHOLDER)
+            else:
+                parts.append(block["text"])
+    return "".join(parts)
+
+
+def shared_prefix_len(a: str, b: str) -> int:
+    limit = min(len(a), len(b))
+    i = 0
+    while i < limit and a[i] == b[i]:
+        i += 1
+    return i
+
+
+def sample_session() -> tuple[NewsArticle, list[NewsArticle]]:
+    paragraph = (
+        "The new open-weight model family ships in 4B, 12B and 27B sizes with a 128k context window. "
+        "It adds native function calling, improved multilingual quality and a vision encoder. "
+    )
+    articles = [
+        NewsArticle(
+            title=f"Story {i}: model release roundup",
+            content=paragraph * 30,
+            url=f"https://example.com/story-{i}",
+            source="Example Blog",
+            published_at="2025-12-09T10:00:00+00:00",
+            image_url="https://example.com/hero.jpg" if i == 0 else None,
+        )
+        for i in range(12)
+    ]
+    return articles[0], articles
+
+
+def run(rounds: int) -> None:
+    selected, articles = sample_session()
+    image = "data:image/jpeg;base64," + "A" * 64
+    seen: list[str] = []
+    total = reused = 0
+
+    draft: TweetDraft | None = None
+    critique: Critique | None = None
+
+    print(f"{'call':<12}{'prompt':>10}{'cached':>10}")
+    for round_no in range(1, rounds + 1):
+        calls = [("writer", writer.build_messages(selected, image, critique, draft))]
+
+        draft = TweetDraft(
+            content=f"Draft {round_no}: the 27B model fits on one GPU and reads images. " * 2,
+            reasoning=f"Attempt {round_no}, focused on the hardware angle.",
+        )
+        calls.append(("critic", critic.build_messages(selected, articles, draft)))
+        critique = Critique(score=6, feedback=f"Round {round_no}: add a concrete number.", is_approved=False)
+
+        for name, messages in calls:
+            prompt = render(messages)
+            best = max((shared_prefix_len(prompt, earlier) for earlier in seen), default=0)
+            seen.append(prompt)
+
+            prompt_tokens = estimate_tokens(prompt)
+            cached_tokens = estimate_tokens(prompt[:best])
+            total += prompt_tokens
+            reused += cached_tokens
+            print(f"{name + ' #' + str(round_no):<12}{prompt_tokens:>10}{cached_tokens:>10}")
+
+    print(f"\nSession prefill tokens: {total}")
+    print(f"Served from prefix cache: {reused} ({reused / total:.0%})")
+    print(f"Prefill tokens computed: {total - reused}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Prefix-cache reuse across writer/critic iterations")
+    parser.add_argument("--rounds", type=int, default=3, help="Writer/critic rounds per session")
+    run(parser.parse_args().rounds)
+
+
+if __name__ == "__main__":
+    main()
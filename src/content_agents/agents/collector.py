@@ -1,20 +1,83 @@
+import asyncio
 import random
 
+from langchain_core.runnables import RunnableConfig
+
+from src.content_agents.core.config import settings
+from src.content_agents.core.dedup import canonicalize_url
 from src.content_agents.core.logger import logger
 from src.content_agents.graph.state import AgentState
-from src.content_agents.services.history import history_service
-from src.content_agents.services.news_fetcher import news_service
+from src.content_agents.schemas.data_types import NewsArticle
+from src.content_agents.services.channel import Channel, get_channel
+
+
+def _filter_processed(articles: list[NewsArticle], channel: Channel) -> list[NewsArticle]:
+    """
+    Drop articles that have already been published (by canonical URL or near-duplicate content)
+    and repeated links to the same story within the batch.
+    """
+    fresh = []
+    seen_urls = set()
+    for art in articles:
+        canonical = canonicalize_url(art.url)
+        if canonical in seen_urls or channel.history.is_duplicate(art):
+            continue
+        seen_urls.add(canonical)
+        fresh.append(art)
+    return fresh
+
+
+def _session_update(topic: str, articles: list[NewsArticle], tried: list[str]) -> dict:
+    """State update that starts a fresh writing session for the chosen rubric."""
+    return {
+        "topic": topic,
+        "articles": articles,
+        "tried_rubrics": tried,
+        "selected_article": None,
+        "draft": None,
+        "critique_history": [],
+        "iteration_count": 0,
+    }
+
+
+def _collect_prefetched(
+    available_rubrics: list[dict],
+    channel: Channel,
+    index: dict[str, list[NewsArticle]] | None = None,
+) -> dict:
+    """
+    Fetch all remaining rubrics in one parallel wave (unless the scheduler already supplied
+    an article index), then pick a rubric (by weight) among those that actually have fresh articles.
+    """
+    if index is None:
+        index = channel.news.fetch_all_rubrics(available_rubrics)
+    fresh_index = {r["rubric"]: _filter_processed(index.get(r["rubric"], []), channel) for r in available_rubrics}
+
+    candidates = [r for r in available_rubrics if fresh_index[r["rubric"]]]
+    if not candidates:
+        logger.warning("No fresh articles in any rubric.")
+        return {"articles": [], "topic": "None", "tried_rubrics": [r["rubric"] for r in available_rubrics]}
+
+    weights = [r.get("weight", 1.0) for r in candidates]
+    topic = random.choices(candidates, weights=weights, k=1)[0]["rubric"]
+    fresh_articles = fresh_index[topic]
 
+    logger.info("Found fresh articles", count=len(fresh_articles), rubric=topic, rubrics_with_news=len(candidates))
+    return _session_update(topic, fresh_articles, [topic])
 
-def collector_node(state: AgentState) -> dict:
+
+def collector_node(state: AgentState, config: RunnableConfig | None = None) -> dict:
     """
     Collector Agent:
     Finds a rubric that hasn't been checked yet and fetches news.
     Filters out articles that have already been published (deduplication).
+    In prefetch mode all rubrics are fetched at once, so no retry loop is needed.
+    In daemon mode the scheduler's ready queue is used and nothing is fetched here.
     """
     logger.info("Collector Agent looking for fresh sources...")
 
-    all_sources = news_service.load_sources()
+    channel = get_channel(config)
+    all_sources = channel.news.load_sources()
     if not all_sources:
         return {"articles": []}
 
@@ -25,36 +88,31 @@ def collector_node(state: AgentState) -> dict:
         logger.warning("All rubrics checked. No news found.")
         return {"articles": [], "topic": "None"}
 
+    if state.get("article_index") is not None:
+        return _collect_prefetched(available_rubrics, channel, state["article_index"])
+
+    if settings.collector_prefetch_all:
+        return _collect_prefetched(available_rubrics, channel)
+
     weights = [r.get("weight", 1.0) for r in available_rubrics]
     selected_rubric = random.choices(available_rubrics, weights=weights, k=1)[0]
     topic = selected_rubric["rubric"]
 
     logger.info("Checking rubric", rubric=topic)
 
-    raw_articles = news_service.fetch_news_from_rubric(selected_rubric)
+    raw_articles = channel.news.fetch_news_from_rubric(selected_rubric)
 
-    fresh_articles = [art for art in raw_articles if not history_service.is_processed(art.url)]
+    fresh_articles = _filter_processed(raw_articles, channel)
 
     if not fresh_articles:
         logger.info("All articles in this rubric were already processed.", rubric=topic)
-        return {
-            "topic": topic,
-            "articles": [],
-            "tried_rubrics": [topic],
-            "selected_article": None,
-            "draft": None,
-            "critique_history": [],
-            "iteration_count": 0,
-        }
+        return _session_update(topic, [], [topic])
 
     logger.info("Found fresh articles", count=len(fresh_articles), rubric=topic)
 
-    return {
-        "topic": topic,
-        "articles": fresh_articles,
-        "tried_rubrics": [topic],
-        "selected_article": None,
-        "draft": None,
-        "critique_history": [],
-        "iteration_count": 0,
-    }
+    return _session_update(topic, fresh_articles, [topic])
+
+
+async def acollector_node(state: AgentState, config: RunnableConfig | None = None) -> dict:
+    """Async variant of collector_node. Feed downloads and history lookups are blocking, so they run in a worker thread."""
+    return await asyncio.to_thread(collector_node, state, config)
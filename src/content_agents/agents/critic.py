@@ -1,14 +1,22 @@
-from langchain_core.messages import HumanMessage, SystemMessage
+from typing import NamedTuple
+
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 from langchain_core.output_parsers import PydanticOutputParser
+from langchain_core.runnables import Runnable
 
 from src.content_agents.core.config import settings
-from src.content_agents.core.llm import get_llm
+from src.content_agents.core.dedup import jaccard_similarity, shingles
+from src.content_agents.core.llm import abatch_limited, get_llm, parse_result, raw_message, with_json_schema
 from src.content_agents.core.logger import logger
+from src.content_agents.core.utils import estimate_tokens, truncate_to_tokens
 from src.content_agents.graph.state import AgentState
-from src.content_agents.schemas.data_types import Critique
+from src.content_agents.schemas.data_types import Critique, NewsArticle, TweetDraft
 
 parser = PydanticOutputParser(pydantic_object=Critique)
 
+# Words from the title and lead compared when looking for related coverage.
+RELATED_WORDS = 120
+
 SYSTEM_PROMPT = f"""You are a Senior Chief Editor at a top-tier tech news outlet.
 Your job is to CRITIQUE the provided tweet draft based on the source articles.
 
@@ -27,66 +35,203 @@ Return a JSON matching the following schema:
 {{format_instructions}}
 """
 
+# Formatted once so every call starts with byte-identical tokens (vLLM prefix caching).
+SYSTEM_MESSAGE = SystemMessage(content=SYSTEM_PROMPT.format(format_instructions=parser.get_format_instructions()))
 
-def critic_node(state: AgentState) -> dict:
+
+def _related_articles(selected: NewsArticle, articles: list[NewsArticle]) -> list[NewsArticle]:
     """
-    Critic Agent:
-    1. Checks hard constraints (Length).
-    2. Reviews the current draft using LLM.
+    Other articles on the same story, most similar first: word-set Jaccard similarity of title and
+    lead of at least critic_related_min_similarity. Near-duplicates (same story cluster) score
+    highest; unrelated stories of the same fetch are left out, so the list may be empty.
     """
-    logger.info("Critic Agent reviewing draft...")
+    words = shingles(f"{selected.title}\n{selected.content}", 1, RELATED_WORDS)
+    scored = []
+    for article in articles:
+        if article.url == selected.url:
+            continue
+        similarity = jaccard_similarity(words, shingles(f"{article.title}\n{article.content}", 1, RELATED_WORDS))
+        if similarity >= settings.critic_related_min_similarity:
+            scored.append((similarity, article))
+
+    scored.sort(key=lambda item: item[0], reverse=True)
+    return [article for _, article in scored[: settings.critic_related_articles]]
 
-    draft = state.get("draft")
-    if not draft:
-        return {}
 
-    # --- HARD CONSTRAINT CHECK (Python side) ---
-    if len(draft.content) > settings.twitter_max_length:
-        logger.warning("Draft is too long, rejecting automatically.", length=len(draft.content))
-        return {
-            "critique_history": [
-                Critique(
-                    score=2,
-                    is_approved=False,
-                    feedback=f"Too long! The draft is {len(draft.content)} characters, but the limit is {settings.twitter_max_length}. Shorten it significantly.",
-                ),
-            ],
-        }
-
-    # --- LLM Semantic Review ---
-    articles = state.get("articles")
-    articles_text = "\n\n".join([a.to_markdown() for a in articles])
-
-    content = f"""
-    --- SOURCE ARTICLES ---
-    {articles_text}
-    
-    --- PROPOSED TWEET DRAFT ---
-    {draft.content}
-    
-    --- REASONING GIVEN BY WRITER ---
-    {draft.reasoning}
+def _build_source_context(selected: NewsArticle, articles: list[NewsArticle], budget_tokens: int) -> str:
     """
+    Source material for the critic within a hard token budget:
+    the selected article in full (truncated only if it alone exceeds the budget),
+    then short summaries of related coverage (see _related_articles) while budget remains.
+    """
+    related_header = "RELATED COVERAGE (for context only):"
+    selected_text = truncate_to_tokens(selected.to_markdown(), budget_tokens)
+    parts = [selected_text]
+    remaining = budget_tokens - estimate_tokens(selected_text) - estimate_tokens(related_header) - 1
 
-    llm = get_llm(temperature=0.0)
+    summaries = []
+    for article in _related_articles(selected, articles):
+        summary = f"- {article.title} ({article.source}): {article.content[: settings.critic_related_summary_chars]}"
+        cost = estimate_tokens(summary) + 1
+        if cost > remaining:
+            break
+        summaries.append(summary)
+        remaining -= cost
 
-    messages = [
-        SystemMessage(content=SYSTEM_PROMPT.format(format_instructions=parser.get_format_instructions())),
-        HumanMessage(content=content),
-    ]
+    if summaries:
+        parts.append(related_header + "\n" + "\n".join(summaries))
+
+    return "\n\n".join(parts)
 
-    try:
-        response = llm.invoke(messages)
-        critique = parser.parse(response.content)
 
-        logger.info("Critique generated", score=critique.score, approved=critique.is_approved)
+def build_messages(selected: NewsArticle, articles: list[NewsArticle], draft: TweetDraft) -> list[BaseMessage]:
+    """
+    Build the critic prompt as a stable prefix (system prompt, source material)
+    followed by the varying suffix (the draft under review), so retries reuse the KV cache.
+    """
+    articles_text = _build_source_context(selected, articles, settings.critic_context_tokens)
+
+    prefix = f"--- SOURCE ARTICLES ---\n{articles_text}\n\n"
+    suffix = f"--- PROPOSED TWEET DRAFT ---\n{draft.content}\n\n--- REASONING GIVEN BY WRITER ---\n{draft.reasoning}\n"
+
+    return [SYSTEM_MESSAGE, HumanMessage(content=prefix + suffix)]
+
+
+def _length_rejection(draft: TweetDraft) -> Critique | None:
+    """HARD CONSTRAINT CHECK (Python side): reject over-long drafts without calling the LLM."""
+    if len(draft.content) <= settings.twitter_max_length:
+        return None
+
+    logger.warning("Draft is too long, rejecting automatically.", length=len(draft.content))
+    return Critique(
+        score=2,
+        is_approved=False,
+        feedback=f"Too long! The draft is {len(draft.content)} characters, but the limit is {settings.twitter_max_length}. Shorten it significantly.",
+    )
+
 
-        return {
-            "critique_history": [critique],
-        }
+def _select_source(state: AgentState) -> NewsArticle | None:
+    articles = state.get("articles") or []
+    selected = state.get("selected_article") or (articles[0] if articles else None)
+    if selected is None:
+        logger.error("Critic received no source article!")
+    return selected
 
+
+def _review_messages(state: AgentState, selected: NewsArticle, draft: TweetDraft) -> list[BaseMessage]:
+    messages = build_messages(selected, state.get("articles") or [], draft)
+
+    logger.info("Critic prompt built", estimated_tokens=sum(estimate_tokens(m.content) for m in messages))
+    return messages
+
+
+def _critique_from(response: BaseMessage | dict | Exception) -> Critique:
+    if isinstance(response, Exception):
+        logger.error("Critic failed", error=str(response))
+        return Critique(score=1, feedback="System error during critique.", is_approved=False)
+
+    usage = raw_message(response).usage_metadata or {}
+    logger.info(
+        "Critic token usage",
+        input_tokens=usage.get("input_tokens"),
+        cached_tokens=usage.get("input_token_details", {}).get("cache_read"),
+        output_tokens=usage.get("output_tokens"),
+    )
+
+    try:
+        critique = parse_result(response, parser)
     except Exception as e:
         logger.error("Critic failed", error=str(e))
-        return {
-            "critique_history": [Critique(score=1, feedback="System error during critique.", is_approved=False)],
-        }
+        return Critique(score=1, feedback="System error during critique.", is_approved=False)
+
+    logger.info("Critique generated", score=critique.score, approved=critique.is_approved)
+    return critique
+
+
+def _best_candidate(candidates: list[TweetDraft], critiques: list[Critique]) -> dict:
+    """
+    Forward the best candidate: approved first, then by score, then the shorter one.
+    If none is approved, the best rejected one goes back to the writer with its feedback.
+    """
+    best = max(
+        range(len(candidates)),
+        key=lambda i: (critiques[i].is_approved, critiques[i].score, -len(candidates[i].content)),
+    )
+    if len(candidates) > 1:
+        logger.info(
+            "Best-of-N review",
+            scores=[c.score for c in critiques],
+            chosen=best,
+            approved=critiques[best].is_approved,
+        )
+
+    return {
+        "draft": candidates[best],
+        "critique_history": [critiques[best]],
+    }
+
+
+class _Review(NamedTuple):
+    llm: Runnable
+    inputs: list[list[BaseMessage]]
+    candidates: list[TweetDraft]
+    critiques: list[Critique | None]
+    pending: list[int]
+
+
+def _prepare_review(state: AgentState) -> _Review | None:
+    """
+    Everything before the LLM call: hard length check on every candidate (no LLM needed),
+    then one review prompt per candidate still pending. None if there is nothing to review.
+    """
+    logger.info("Critic Agent reviewing draft...")
+
+    draft = state.get("draft")
+    if not draft:
+        return None
+
+    candidates = state.get("draft_candidates") or [draft]
+    critiques = [_length_rejection(candidate) for candidate in candidates]
+    pending = [i for i, critique in enumerate(critiques) if critique is None]
+
+    inputs = []
+    if pending:
+        selected = _select_source(state)
+        if selected is None:
+            return None
+        inputs = [_review_messages(state, selected, candidates[i]) for i in pending]
+
+    llm = with_json_schema(get_llm(profile="critic"), Critique)
+    return _Review(llm, inputs, candidates, critiques, pending)
+
+
+def _finish_review(review: _Review, responses: list[BaseMessage | dict | Exception]) -> dict:
+    critiques = list(review.critiques)
+    for i, response in zip(review.pending, responses, strict=True):
+        critiques[i] = _critique_from(response)
+    return _best_candidate(review.candidates, critiques)
+
+
+def critic_node(state: AgentState) -> dict:
+    """
+    Critic Agent:
+    1. Checks hard constraints (Length).
+    2. Reviews the current draft using LLM.
+    In best-of-N mode all writer candidates are reviewed in one batch and the best one is kept.
+    """
+    review = _prepare_review(state)
+    if review is None:
+        return {}
+
+    responses = review.llm.batch(review.inputs, return_exceptions=True)
+    return _finish_review(review, responses)
+
+
+async def acritic_node(state: AgentState) -> dict:
+    """Async variant of critic_node for the async graph."""
+    review = _prepare_review(state)
+    if review is None:
+        return {}
+
+    responses = await abatch_limited(review.llm, review.inputs)
+    return _finish_review(review, responses)
@@ -1,10 +1,18 @@
-from langchain_core.messages import HumanMessage, SystemMessage
+from typing import NamedTuple
+
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 from langchain_core.output_parsers import PydanticOutputParser
-from pydantic import BaseModel, Field
+from langchain_core.runnables import Runnable, RunnableConfig
+from pydantic import BaseModel, Field, create_model
 
-from src.content_agents.core.llm import get_llm
+from src.content_agents.core.config import settings
+from src.content_agents.core.llm import get_llm, llm_semaphore, parse_result, with_json_schema
 from src.content_agents.core.logger import logger
 from src.content_agents.graph.state import AgentState
+from src.content_agents.schemas.data_types import NewsArticle
+from src.content_agents.services.channel import get_channel
+from src.content_agents.services.image_cache import image_cache
+from src.content_agents.services.ranking import article_ranker, source_weights
 
 
 class EditorSelection(BaseModel):
@@ -14,6 +22,16 @@ class EditorSelection(BaseModel):
 
 parser = PydanticOutputParser(pydantic_object=EditorSelection)
 
+
+def _selection_schema(count: int) -> type[EditorSelection]:
+    """EditorSelection with index bounded to the candidate list, so guided decoding cannot return an invalid index."""
+    return create_model(
+        "EditorSelectionOutput",
+        __base__=EditorSelection,
+        index=(int, Field(..., ge=0, le=count - 1, description="Index of the best article (0-based)")),
+    )
+
+
 SYSTEM_PROMPT = """You are a Lead Editor for an AI News Channel.
 You have a list of potential news stories.
 
@@ -27,34 +45,96 @@ Return a JSON with the 'index' of the selected article and your 'reasoning'.
 """
 
 
-def editor_node(state: AgentState) -> dict:
+def _selection_messages(articles: list[NewsArticle]) -> list[BaseMessage]:
+    titles_text = "\n".join(
+        f"{i}. {a.title} (Source: {a.source}{f', covered by {a.cluster_size} sources' if a.cluster_size > 1 else ''})"
+        for i, a in enumerate(articles)
+    )
+
+    return [
+        SystemMessage(content=SYSTEM_PROMPT.format(format_instructions=parser.get_format_instructions())),
+        HumanMessage(content=f"Here are the candidate stories:\n\n{titles_text}"),
+    ]
+
+
+def _shortlist(articles: list[NewsArticle], config: RunnableConfig | None) -> list[NewsArticle]:
+    """
+    Rank the candidates on CPU and keep the top editor_max_candidates for the LLM.
+    The first entry doubles as the fallback when the editor call fails.
+    """
+    weights = source_weights(get_channel(config).news.load_sources())
+    ranked = article_ranker.rank(articles, weights)[: settings.editor_max_candidates]
+    logger.info("Pre-ranked candidates", candidates=len(articles), shortlisted=len(ranked), top=ranked[0].title)
+    return ranked
+
+
+class _Selection(NamedTuple):
+    llm: Runnable
+    messages: list[BaseMessage]
+    articles: list[NewsArticle]
+
+
+def _prepare_selection(state: AgentState, config: RunnableConfig | None) -> _Selection | None:
+    """Everything before the LLM call: shortlist, image prefetch and prompt. None if there is nothing to choose from."""
     logger.info("Editor Agent selecting the best story...")
 
     articles = state.get("articles", [])
     if not articles:
-        return {}
+        return None
 
-    titles_text = "\n".join([f"{i}. {a.title} (Source: {a.source})" for i, a in enumerate(articles)])
+    articles = _shortlist(articles, config)
 
-    llm = get_llm(temperature=0.1)
+    # Overlap image downloads with the editor LLM call; the writer picks them up from the cache.
+    image_cache.prefetch(a.image_url for a in articles[: settings.image_prefetch_limit])
 
-    messages = [
-        SystemMessage(content=SYSTEM_PROMPT.format(format_instructions=parser.get_format_instructions())),
-        HumanMessage(content=f"Here are the candidate stories:\n\n{titles_text}"),
-    ]
+    llm = with_json_schema(get_llm(profile="editor"), _selection_schema(len(articles)))
+    return _Selection(llm, _selection_messages(articles), articles)
+
+
+def _fallback_selection(articles: list[NewsArticle], error: Exception) -> dict:
+    logger.error("Editor failed selection, using the top-ranked article", error=str(error))
+    return {"selected_article": articles[0]}
+
+
+def _apply_selection(response: BaseMessage | dict | Exception, articles: list[NewsArticle]) -> dict:
+    if isinstance(response, Exception):
+        return _fallback_selection(articles, response)
+    try:
+        selection = parse_result(response, parser)
+    except Exception as e:
+        return _fallback_selection(articles, e)
+
+    idx = selection.index
+    if 0 <= idx < len(articles):
+        selected = articles[idx]
+        logger.info("Editor selected story", title=selected.title, reason=selection.reasoning)
+        image_cache.prefetch([selected.image_url])
+        return {"selected_article": selected}
+    logger.error("Editor returned invalid index", index=idx, max_index=len(articles) - 1)
+    return {"selected_article": articles[0]}
+
+
+def editor_node(state: AgentState, config: RunnableConfig | None = None) -> dict:
+    request = _prepare_selection(state, config)
+    if request is None:
+        return {}
 
     try:
-        response = llm.invoke(messages)
-        selection = parser.parse(response.content)
+        response = request.llm.invoke(request.messages)
+    except Exception as e:
+        response = e
+    return _apply_selection(response, request.articles)
+
 
-        idx = selection.index
-        if 0 <= idx < len(articles):
-            selected = articles[idx]
-            logger.info("Editor selected story", title=selected.title, reason=selection.reasoning)
-            return {"selected_article": selected}
-        logger.error("Editor returned invalid index", index=idx, max_index=len(articles) - 1)
-        return {"selected_article": articles[0]}
+async def aeditor_node(state: AgentState, config: RunnableConfig | None = None) -> dict:
+    """Async variant of editor_node for the async graph."""
+    request = _prepare_selection(state, config)
+    if request is None:
+        return {}
 
+    try:
+        async with llm_semaphore():
+            response = await request.llm.ainvoke(request.messages)
     except Exception as e:
-        logger.error("Editor failed selection", error=str(e))
-        return {"selected_article": articles[0]}
+        response = e
+    return _apply_selection(response, request.articles)
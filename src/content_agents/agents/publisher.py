@@ -1,8 +1,11 @@
+import asyncio
+
+from langchain_core.runnables import RunnableConfig
+
 from src.content_agents.core.config import settings
 from src.content_agents.core.logger import logger
 from src.content_agents.graph.state import AgentState
-from src.content_agents.services.history import history_service
-from src.content_agents.services.twitter_client import twitter_service
+from src.content_agents.services.channel import get_channel
 
 
 def _smart_truncate(content: str, max_length: int) -> str:
@@ -33,7 +36,7 @@ def _smart_truncate(content: str, max_length: int) -> str:
     return content[: max_length - 1] + "."
 
 
-def publisher_node(state: AgentState) -> dict:
+def publisher_node(state: AgentState, config: RunnableConfig | None = None) -> dict:
     """
     Publish Agent:
     Takes the approved draft and pushes it to X (Twitter).
@@ -42,6 +45,8 @@ def publisher_node(state: AgentState) -> dict:
     """
     logger.info("Publisher Agent starting...")
 
+    channel = get_channel(config)
+
     draft = state.get("draft")
     article = state.get("selected_article")
 
@@ -63,7 +68,7 @@ def publisher_node(state: AgentState) -> dict:
             result_snippet=content[-30:],
         )
 
-    tweet_id = twitter_service.post_tweet(
+    tweet_id = channel.twitter.post_tweet(
         text=content,
         media_urls=draft.media_files,
     )
@@ -72,7 +77,7 @@ def publisher_node(state: AgentState) -> dict:
         logger.info("Content cycle finished successfully.", tweet_id=tweet_id)
 
         if article and article.url:
-            history_service.add(article.url)
+            channel.history.add_article(article)
         else:
             logger.warning("Published tweet but couldn't find source URL to save in history.")
 
@@ -80,3 +85,8 @@ def publisher_node(state: AgentState) -> dict:
 
     logger.error("Publishing failed.")
     return {}
+
+
+async def apublisher_node(state: AgentState, config: RunnableConfig | None = None) -> dict:
+    """Async variant of publisher_node. tweepy and the history store are blocking, so they run in a worker thread."""
+    return await asyncio.to_thread(publisher_node, state, config)
@@ -1,15 +1,31 @@
-from langchain_core.messages import HumanMessage, SystemMessage
+import asyncio
+from functools import partial
+from typing import NamedTuple
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
 from langchain_core.output_parsers import PydanticOutputParser
+from langchain_core.runnables import Runnable, RunnableLambda
+from langchain_openai import ChatOpenAI
+from pydantic import Field, create_model
 
 from src.content_agents.core.config import settings
-from src.content_agents.core.llm import get_llm
+from src.content_agents.core.llm import abatch_limited, get_llm, parse_result, raw_message, with_json_schema
 from src.content_agents.core.logger import logger
-from src.content_agents.core.utils import download_image_as_base64
+from src.content_agents.core.streaming import FieldStreamResult, astream_json_field, stream_json_field
 from src.content_agents.graph.state import AgentState
-from src.content_agents.schemas.data_types import TweetDraft
+from src.content_agents.schemas.data_types import Critique, NewsArticle, TweetDraft
+from src.content_agents.services.image_cache import image_cache
 
 parser = PydanticOutputParser(pydantic_object=TweetDraft)
 
+# Guided decoding schema: the fields the model writes, with the platform limit enforced on content,
+# so an over-length draft cannot be generated at all.
+DraftOutput = create_model(
+    "DraftOutput",
+    content=(str, Field(..., max_length=settings.twitter_max_length, description=TweetDraft.model_fields["content"].description)),
+    reasoning=(str, Field(..., description=TweetDraft.model_fields["reasoning"].description)),
+)
+
 SYSTEM_PROMPT = f"""You are a Senior Tech Journalist writing for X (Twitter).
 
 YOUR TASK:
@@ -25,101 +41,211 @@ OUTPUT FORMAT:
 {{format_instructions}}
 """
 
+# Formatted once so every call starts with byte-identical tokens (vLLM prefix caching).
+SYSTEM_MESSAGE = SystemMessage(content=SYSTEM_PROMPT.format(format_instructions=parser.get_format_instructions()))
 
-def writer_node(state: AgentState) -> dict:
-    logger.info("Writer Agent starting...")
 
-    current_iter = state.get("iteration_count", 0)
-    new_iter = current_iter
-    if state.get("critique_history"):
-        new_iter += 1
+def _feedback_block(critique: Critique, previous_draft: TweetDraft | None) -> dict:
+    """The only part of the prompt that changes between rewrite iterations."""
+    if "Too long" in critique.feedback:
+        instruction = "CRITICAL: The text is too long. REMOVE all adjectives. REMOVE hashtags if needed. Make it 50% shorter."
+    else:
+        instruction = "Rewrite the tweet to address this feedback explicitly."
 
-    article = state.get("selected_article")
+    feedback_prompt = f"""
+        ⚠️ IMPORTANT: FEEDBACK ON PREVIOUS VERSION
+        Your previous draft was REJECTED with score {critique.score}/10.
 
-    if not article:
-        logger.error("Writer received no selected article!")
-        return {"draft": None}
+        PREVIOUS DRAFT ({len(previous_draft.content) if previous_draft else 0} chars):
+        {previous_draft.content if previous_draft else "N/A"}
+
+        EDITOR FEEDBACK:
+        "{critique.feedback}"
+
+        INSTRUCTION:
+        {instruction}
+        Target length: < {settings.writer_target_length} characters.
+        """
+
+    return {"type": "text", "text": feedback_prompt}
 
-    content_blocks = []
 
-    content_blocks.append(
+def build_messages(
+    article: NewsArticle,
+    image_data_url: str | None = None,
+    critique: Critique | None = None,
+    previous_draft: TweetDraft | None = None,
+) -> list[BaseMessage]:
+    """
+    Build the writer prompt as a stable prefix followed by a varying suffix.
+
+    Prefix (identical on every iteration of a session): system prompt with format
+    instructions, source material, image. Suffix: feedback on the previous draft.
+    Gemma's chat template requires alternating roles, so the suffix is appended as
+    the last content block of the same user turn rather than as a separate message.
+    """
+    content_blocks = [
         {
             "type": "text",
             "text": f"SOURCE MATERIAL:\n{article.to_markdown()}",
         },
-    )
+    ]
+
+    if image_data_url:
+        content_blocks.append(
+            {
+                "type": "image_url",
+                "image_url": {"url": image_data_url},
+            },
+        )
+
+    if critique:
+        content_blocks.append(_feedback_block(critique, previous_draft))
+
+    return [SYSTEM_MESSAGE, HumanMessage(content=content_blocks)]
+
+
+def _next_iteration(state: AgentState) -> int:
+    current_iter = state.get("iteration_count", 0)
+    return current_iter + 1 if state.get("critique_history") else current_iter
+
 
-    image_attached = False
-    if article.image_url:
-        b64_img = download_image_as_base64(article.image_url)
-        if b64_img:
-            content_blocks.append(
-                {
-                    "type": "image_url",
-                    "image_url": {"url": f"data:image/jpeg;base64,{b64_img}"},
-                },
-            )
-            image_attached = True
-            logger.info("Attached image to prompt", url=article.image_url)
+def _draft_messages(state: AgentState, article: NewsArticle, image_data_url: str | None) -> list[BaseMessage]:
+    if image_data_url:
+        logger.info("Attached image to prompt", url=article.image_url)
 
     # Feedback Loop
     critique_history = state.get("critique_history", [])
-    if critique_history:
-        last_critique = critique_history[-1]
-        previous_draft = state.get("draft")
-
+    last_critique = critique_history[-1] if critique_history else None
+    if last_critique:
         logger.info("Writer received feedback", feedback=last_critique.feedback)
 
-        if "Too long" in last_critique.feedback:
-            instruction = "CRITICAL: The text is too long. REMOVE all adjectives. REMOVE hashtags if needed. Make it 50% shorter."
-        else:
-            instruction = "Rewrite the tweet to address this feedback explicitly."
+    return build_messages(article, image_data_url, last_critique, state.get("draft"))
 
-        feedback_prompt = f"""
-        ⚠️ IMPORTANT: FEEDBACK ON PREVIOUS VERSION
-        Your previous draft was REJECTED with score {last_critique.score}/10.
-        
-        PREVIOUS DRAFT ({len(previous_draft.content) if previous_draft else 0} chars):
-        {previous_draft.content if previous_draft else "N/A"}
-        
-        EDITOR FEEDBACK:
-        "{last_critique.feedback}"
-        
-        INSTRUCTION:
-        {instruction}
-        Target length: < {settings.writer_target_length} characters.
-        """
 
-        content_blocks.append(
-            {
-                "type": "text",
-                "text": feedback_prompt,
-            },
-        )
+def _streamed_draft(result: FieldStreamResult) -> BaseMessage | dict:
+    """
+    Turn a streamed completion into a writer result. A draft cut off at the length limit is
+    returned as is, so the critic's length check rejects it at once and the next round shortens it.
+    """
+    if not result.exceeded:
+        return AIMessage(content=result.text)
 
-    llm = get_llm(temperature=0.7)
+    logger.warning("Draft passed the length limit while streaming, generation aborted", length=len(result.value))
+    draft = TweetDraft(content=result.value, reasoning="Generation aborted at the length limit.")
+    return {"raw": AIMessage(content=result.text), "parsed": draft, "parsing_error": None}
 
-    messages = [
-        SystemMessage(content=SYSTEM_PROMPT.format(format_instructions=parser.get_format_instructions())),
-        HumanMessage(content=content_blocks),
-    ]
 
-    try:
-        response = llm.invoke(messages)
-        draft = parser.parse(response.content)
+def _stream_draft(llm: Runnable, messages: list[BaseMessage]) -> BaseMessage | dict:
+    return _streamed_draft(stream_json_field(llm, messages, "content", settings.twitter_max_length))
+
+
+async def _astream_draft(llm: Runnable, messages: list[BaseMessage]) -> BaseMessage | dict:
+    return _streamed_draft(await astream_json_field(llm, messages, "content", settings.twitter_max_length))
+
+
+def _draft_runnable(llm: ChatOpenAI) -> Runnable:
+    """
+    How drafts are requested: one (guided JSON) completion, or with writer_streaming a stream
+    whose content field is followed token by token and cut off once it passes the tweet limit.
+    """
+    if not settings.writer_streaming:
+        return with_json_schema(llm, DraftOutput)
 
-        if image_attached:
-            draft.media_files = [article.image_url]
-        else:
-            draft.media_files = []
+    if settings.llm_structured_output:
+        llm = llm.bind(response_format=DraftOutput)
+    return RunnableLambda(partial(_stream_draft, llm), afunc=partial(_astream_draft, llm))
 
-        logger.info("Draft generated successfully", content_snippet=draft.content[:50], length=len(draft.content))
 
-        return {
-            "draft": draft,
-            "iteration_count": new_iter,
-        }
+def _parse_draft(response: BaseMessage | dict | Exception, article: NewsArticle, image_data_url: str | None) -> TweetDraft | None:
+    if isinstance(response, Exception):
+        logger.error("Writer failed to generate draft", error=str(response))
+        return None
 
+    usage = raw_message(response).usage_metadata or {}
+    logger.info(
+        "Writer token usage",
+        input_tokens=usage.get("input_tokens"),
+        cached_tokens=usage.get("input_token_details", {}).get("cache_read"),
+        output_tokens=usage.get("output_tokens"),
+    )
+
+    try:
+        draft = TweetDraft.model_validate(parse_result(response, parser).model_dump())
     except Exception as e:
         logger.error("Writer failed to generate draft", error=str(e))
-        return {"draft": None}
+        return None
+
+    if image_data_url:
+        draft.media_files = [article.image_url]
+    else:
+        draft.media_files = []
+
+    logger.info("Draft generated successfully", content_snippet=draft.content[:50], length=len(draft.content))
+    return draft
+
+
+class _DraftRequest(NamedTuple):
+    llm: Runnable
+    inputs: list[list[BaseMessage]]
+    article: NewsArticle
+    image_data_url: str | None
+    iteration: int
+
+
+def _writer_article(state: AgentState) -> NewsArticle | None:
+    logger.info("Writer Agent starting...")
+
+    article = state.get("selected_article")
+    if not article:
+        logger.error("Writer received no selected article!")
+    return article
+
+
+def _prepare_drafts(state: AgentState, article: NewsArticle, image_data_url: str | None) -> _DraftRequest:
+    """One prompt per candidate (writer_candidates), all identical so vLLM shares their prefix."""
+    llm = _draft_runnable(get_llm(profile="writer"))
+    messages = _draft_messages(state, article, image_data_url)
+    return _DraftRequest(llm, [messages] * settings.writer_candidates, article, image_data_url, _next_iteration(state))
+
+
+def _finish_drafts(request: _DraftRequest, responses: list[BaseMessage | dict | Exception]) -> dict:
+    """Parse all candidates; the critic reviews them together and keeps the best one."""
+    drafts = [draft for response in responses if (draft := _parse_draft(response, request.article, request.image_data_url))]
+    if not drafts:
+        return {"draft": None, "draft_candidates": []}
+
+    return {
+        "draft": drafts[0],
+        "draft_candidates": drafts,
+        "iteration_count": request.iteration,
+    }
+
+
+def writer_node(state: AgentState) -> dict:
+    """
+    Writer Agent: drafts a tweet about the selected article, addressing the last critique if any.
+    With writer_candidates > 1, that many drafts are requested concurrently (best-of-N).
+    """
+    article = _writer_article(state)
+    if not article:
+        return {"draft": None, "draft_candidates": []}
+
+    image_data_url = image_cache.get_data_url(article.image_url) if article.image_url else None
+
+    request = _prepare_drafts(state, article, image_data_url)
+    responses = request.llm.batch(request.inputs, return_exceptions=True)
+    return _finish_drafts(request, responses)
+
+
+async def awriter_node(state: AgentState) -> dict:
+    """Async variant of writer_node; the image (possibly still downloading) is awaited in a worker thread."""
+    article = _writer_article(state)
+    if not article:
+        return {"draft": None, "draft_candidates": []}
+
+    image_data_url = await asyncio.to_thread(image_cache.get_data_url, article.image_url) if article.image_url else None
+
+    request = _prepare_drafts(state, article, image_data_url)
+    responses = await abatch_limited(request.llm, request.inputs)
+    return _finish_drafts(request, responses)
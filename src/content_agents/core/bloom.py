@@ -0,0 +1,38 @@
+import hashlib
+import math
+from collections.abc import Iterable
+
+
+class BloomFilter:
+    """
+    Compact probabilistic set of strings.
+    Membership may return false positives (at roughly error_rate) but never false negatives,
+    so a miss is a definite "never seen".
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        capacity = max(capacity, 1)
+        self.size = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    @classmethod
+    def from_items(cls, items: Iterable[str], capacity: int, error_rate: float = 0.01) -> "BloomFilter":
+        bloom = cls(capacity, error_rate)
+        for item in items:
+            bloom.add(item)
+        return bloom
+
+    def _positions(self, item: str) -> list[int]:
+        """Double hashing: derive all k bit positions from one 128-bit digest."""
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
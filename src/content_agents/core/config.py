@@ -1,20 +1,116 @@
-from pydantic import Field, SecretStr
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict, Field, SecretStr, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+class GenerationProfile(BaseModel):
+    """Sampling and budget settings for one kind of LLM call (see get_llm(profile=...))."""
+
+    model_config = ConfigDict(frozen=True)
+
+    temperature: float = 0.7
+    max_tokens: int = 2048
+    stop: tuple[str, ...] = ("<end_of_turn>", "<eos>")
+    # Per-request timeout in seconds, None uses llm_timeout.
+    timeout: float | None = None
+    # Serve repeated identical prompts from the persistent response cache (low temperatures only).
+    cached: bool = False
+
+
+# Budgets are sized to each node's output schema: a runaway generation is cut at max_tokens
+# instead of holding KV cache blocks and a connection until llm_timeout.
+DEFAULT_GENERATION_PROFILES = {
+    # {"index", "reasoning"}: a number and one or two sentences.
+    "editor": GenerationProfile(temperature=0.1, max_tokens=256, timeout=45.0, cached=True),
+    # {"content" (<= twitter_max_length chars), "reasoning"}.
+    "writer": GenerationProfile(temperature=0.7, max_tokens=512, timeout=60.0),
+    # {"score", "feedback", "is_approved"}: feedback is a short paragraph.
+    "critic": GenerationProfile(temperature=0.0, max_tokens=384, timeout=60.0, cached=True),
+}
+
+
 class Settings(BaseSettings):
     # --- LLM Settings ---
     openai_api_key: SecretStr = Field(default="local-dev-key", alias="VLLM_API_KEY")
     openai_api_base: str = Field(default="http://localhost:8000/v1", alias="OPENAI_API_BASE")
     model_name: str = Field(default="google/gemma-3-27b-it", alias="MODEL_NAME")
+    llm_pool_size: int = 10
+    llm_keepalive_expiry: float = 60.0
+    llm_timeout: float = 120.0
+    llm_connect_timeout: float = 5.0
+    llm_max_retries: int = 2
+    # Guided JSON decoding (response_format json_schema) for editor, writer and critic outputs.
+    llm_structured_output: bool = True
+    # In-flight async requests across all concurrent channel sessions (keep <= llm_pool_size).
+    llm_max_concurrency: int = 8
+    llm_cache_enabled: bool = True
+    llm_cache_path: str = "data/cache/llm.db"
+    llm_cache_ttl_hours: float = 24.0
+    llm_cache_max_entries: int = 1000
+    # Named generation profiles. LLM_PROFILES='{"writer": {"max_tokens": 400}}' overrides single fields.
+    llm_profiles: dict[str, GenerationProfile] = Field(default_factory=lambda: dict(DEFAULT_GENERATION_PROFILES))
 
     # --- App Settings ---
     log_level: str = "INFO"
     environment: str = "development"
 
+    # --- News Fetching ---
+    feed_fetch_timeout: float = 15.0
+    feed_max_concurrency: int = 8
+    feed_cache_enabled: bool = True
+    feed_cache_dir: str = "data/cache/feeds"
+    collector_prefetch_all: bool = True
+    # Default per-feed poll cadence, a source can override it with "poll_minutes".
+    feed_poll_minutes: float = 30.0
+    # Adaptive polling: feeds are polled about twice per observed publishing interval, within these bounds.
+    feed_stats_enabled: bool = True
+    feed_stats_path: str = "data/feed_stats.json"
+    feed_poll_min_minutes: float = 10.0
+    feed_poll_max_minutes: float = 1440.0
+    # Cross-feed story clustering (MinHash-LSH): near-duplicate articles are merged into one story.
+    story_clustering_enabled: bool = True
+    # Estimated Jaccard similarity of title+lead word bigrams at which two articles are the same story.
+    story_cluster_threshold: float = 0.3
+
+    # --- History ---
+    history_db_path: str = "data/history.db"
+    # Must cover the fetcher's time window, otherwise old articles would be republished.
+    history_retention_hours: int = 168
+    history_bloom_enabled: bool = True
+    history_bloom_capacity: int = 10_000
+    # SimHash bits two stories may differ by and still count as the same (max 7).
+    dedup_max_fingerprint_distance: int = 6
+
+    # --- Images ---
+    image_cache_dir: str = "data/cache/images"
+    image_cache_max_mb: int = 200
+    image_max_download_mb: int = 10
+    # Gemma 3's vision encoder works at 896x896, larger images only inflate the request.
+    image_max_dimension: int = 1024
+    image_jpeg_quality: int = 85
+    image_prefetch_limit: int = 5
+    image_prefetch_workers: int = 4
+
+    # --- Ranking ---
+    # The editor LLM only sees this many articles, pre-ranked on CPU (recency, source weight, salience, duplicates).
+    editor_max_candidates: int = 20
+    ranking_half_life_hours: float = 12.0
+
+    # --- Prompt Budgets ---
+    critic_context_tokens: int = 3000
+    critic_related_articles: int = 3
+    # Word-set Jaccard similarity (title + lead) an article needs to the selected one to count as related coverage.
+    critic_related_min_similarity: float = 0.4
+    critic_related_summary_chars: int = 300
+
     # --- Twitter/X Limits ---
     twitter_max_length: int = 280
     writer_target_length: int = 240
+    # Best-of-N: drafts generated concurrently per writer round, the critic keeps the best one.
+    writer_candidates: int = 1
+    # Stream drafts and stop decoding as soon as the tweet text passes twitter_max_length.
+    writer_streaming: bool = False
 
     # --- Twitter/X Credentials ---
     twitter_api_key: SecretStr | None = Field(default=None, alias="API_KEY")
@@ -22,6 +118,20 @@ class Settings(BaseSettings):
     twitter_access_token: SecretStr | None = Field(default=None, alias="ACCESS_TOKEN")
     twitter_access_secret: SecretStr | None = Field(default=None, alias="ACCESS_TOKEN_SECRET")
 
+    @field_validator("llm_profiles", mode="before")
+    @classmethod
+    def _merge_default_profiles(cls, profiles: dict[str, Any]) -> dict[str, Any]:
+        """Overrides only replace the fields they set; the rest keep the profile's defaults."""
+        merged: dict[str, Any] = dict(DEFAULT_GENERATION_PROFILES)
+        for name, override in profiles.items():
+            if isinstance(override, GenerationProfile):
+                merged[name] = override
+            elif name in DEFAULT_GENERATION_PROFILES:
+                merged[name] = {**DEFAULT_GENERATION_PROFILES[name].model_dump(), **override}
+            else:
+                merged[name] = override
+        return merged
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
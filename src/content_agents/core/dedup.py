@@ -0,0 +1,126 @@
+import hashlib
+import random
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+TRACKING_PARAM_PREFIXES = ("utm_", "mc_", "_hs")
+TRACKING_PARAMS = {"fbclid", "gclid", "dclid", "yclid", "igshid", "mkt_tok", "ref", "ref_src", "spm", "cmpid"}
+
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 8
+_BAND_BITS = SIMHASH_BITS // SIMHASH_BANDS
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+MINHASH_PERMUTATIONS = 64
+_MERSENNE_PRIME = (1 << 61) - 1
+# Fixed seed: signatures are compared across processes and restarts.
+_rng = random.Random(0x5EED)
+_MINHASH_PARAMS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME)) for _ in range(MINHASH_PERMUTATIONS)
+]
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalize an article URL so that the same story reached via different links compares equal.
+    Lowercases the host, drops 'www.', default ports, fragments, trailing slashes and tracking
+    query params (utm_*, fbclid, ...), sorts the remaining params and treats http/https alike.
+    """
+    if not url:
+        return ""
+
+    parts = urlsplit(url.strip())
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        return url.strip()
+
+    host = parts.hostname.lower().removeprefix("www.")
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    path = re.sub(r"/{2,}", "/", parts.path).rstrip("/") or "/"
+
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PARAM_PREFIXES)
+    ]
+
+    return urlunsplit(("https", host, path, urlencode(sorted(query)), ""))
+
+
+def simhash(text: str) -> int:
+    """
+    64-bit SimHash over words and word bigrams. Texts that differ only slightly
+    (boilerplate, punctuation, a changed sentence) end up a few bits apart,
+    unrelated texts around 32 bits apart.
+    """
+    words = _WORD_RE.findall(text.lower())
+    features = words + [" ".join(pair) for pair in zip(words, words[1:], strict=False)]
+    if not features:
+        return 0
+
+    vector = [0] * SIMHASH_BITS
+    for feature in features:
+        value = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(SIMHASH_BITS):
+            vector[bit] += 1 if value >> bit & 1 else -1
+
+    return sum(1 << bit for bit, weight in enumerate(vector) if weight > 0)
+
+
+def content_fingerprint(title: str, content: str) -> int:
+    """Near-duplicate fingerprint of an article's title and body."""
+    return simhash(f"{title}\n{content}")
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def simhash_bands(fingerprint: int) -> list[tuple[int, int]]:
+    """
+    Split a fingerprint into (band number, band value) keys.
+    Two fingerprints within SIMHASH_BANDS - 1 bits of each other share at least one band,
+    so an index over bands finds every near-duplicate candidate.
+    """
+    mask = (1 << _BAND_BITS) - 1
+    return [(band, fingerprint >> (band * _BAND_BITS) & mask) for band in range(SIMHASH_BANDS)]
+
+
+def shingles(text: str, size: int = 2, max_words: int | None = None) -> set[str]:
+    """Set of lowercased word n-grams of text, optionally from its first max_words words only."""
+    words = _WORD_RE.findall(text.lower())[:max_words]
+    if len(words) < size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+
+def jaccard_similarity(a: set[str], b: set[str]) -> float:
+    union = len(a | b)
+    return len(a & b) / union if union else 0.0
+
+
+def minhash(features: set[str]) -> tuple[int, ...]:
+    """
+    MinHash signature of a feature set (MINHASH_PERMUTATIONS values).
+    The share of equal positions in two signatures estimates the Jaccard similarity of the sets.
+    """
+    if not features:
+        return (_MERSENNE_PRIME,) * MINHASH_PERMUTATIONS
+
+    hashes = [int.from_bytes(hashlib.blake2b(f.encode("utf-8"), digest_size=8).digest(), "big") for f in features]
+    return tuple(min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in _MINHASH_PARAMS)
+
+
+def minhash_similarity(a: tuple[int, ...], b: tuple[int, ...]) -> float:
+    return sum(x == y for x, y in zip(a, b, strict=True)) / len(a)
+
+
+def minhash_bands(signature: tuple[int, ...], bands: int) -> list[tuple[int, tuple[int, ...]]]:
+    """
+    LSH keys of a signature: (band number, rows of the band).
+    With r = len(signature) / bands rows per band, two sets with Jaccard similarity s
+    share at least one band with probability 1 - (1 - s**r) ** bands.
+    """
+    rows = len(signature) // bands
+    return [(band, signature[band * rows : (band + 1) * rows]) for band in range(bands)]
@@ -1,22 +1,207 @@
+import asyncio
+import threading
+from typing import Any
+from weakref import WeakKeyDictionary
+
+import httpx
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.output_parsers import PydanticOutputParser
+from langchain_core.runnables import Runnable
 from langchain_openai import ChatOpenAI
+from pydantic import BaseModel
+
+from src.content_agents.core.config import GenerationProfile, settings
+from src.content_agents.core.llm_cache import PersistentLLMCache
+
+# Clients for callers without a running event loop (sync nodes).
+_registry: dict[tuple[str, GenerationProfile], ChatOpenAI] = {}
+# Clients for async callers, per event loop: pooled async connections are bound to the loop that opened them.
+_loop_registries: WeakKeyDictionary[asyncio.AbstractEventLoop, dict[tuple[str, GenerationProfile], ChatOpenAI]] = (
+    WeakKeyDictionary()
+)
+_registry_lock = threading.Lock()
+_http_client: httpx.Client | None = None
+_http_async_client: httpx.AsyncClient | None = None
+_loop_http_async_clients: WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = WeakKeyDictionary()
+_response_cache: PersistentLLMCache | None = None
+_semaphores: WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = WeakKeyDictionary()
 
-from src.content_agents.core.config import settings
 
+def _running_loop() -> asyncio.AbstractEventLoop | None:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
 
-def get_llm(temperature: float = 0.7) -> ChatOpenAI:
+
+def _http_clients(loop: asyncio.AbstractEventLoop | None) -> tuple[httpx.Client, httpx.AsyncClient]:
+    """
+    Return the HTTP clients used for LLM calls: one process-wide sync client, and one async
+    client per event loop (a process-wide one for callers without a running loop).
+    One keep-alive pool means writer/critic iterations reuse TCP connections to vLLM; async pools
+    cannot be shared across loops, since each asyncio.run() closes the loop its connections belong to.
+    Must be called with _registry_lock held.
+    """
+    global _http_client, _http_async_client  # noqa: PLW0603
+
+    limits = httpx.Limits(
+        max_connections=settings.llm_pool_size,
+        max_keepalive_connections=settings.llm_pool_size,
+        keepalive_expiry=settings.llm_keepalive_expiry,
+    )
+    timeout = httpx.Timeout(settings.llm_timeout, connect=settings.llm_connect_timeout)
+
+    if _http_client is None:
+        _http_client = httpx.Client(limits=limits, timeout=timeout)
+
+    if loop is None:
+        if _http_async_client is None:
+            _http_async_client = httpx.AsyncClient(limits=limits, timeout=timeout)
+        return _http_client, _http_async_client
+
+    async_client = _loop_http_async_clients.get(loop)
+    if async_client is None:
+        async_client = _loop_http_async_clients[loop] = httpx.AsyncClient(limits=limits, timeout=timeout)
+    return _http_client, async_client
+
+
+def _llm_response_cache() -> PersistentLLMCache:
+    """Lazily open the on-disk response cache. Must be called with _registry_lock held."""
+    global _response_cache  # noqa: PLW0603
+
+    if _response_cache is None:
+        _response_cache = PersistentLLMCache(
+            settings.llm_cache_path,
+            ttl_seconds=settings.llm_cache_ttl_hours * 3600,
+            max_entries=settings.llm_cache_max_entries,
+        )
+    return _response_cache
+
+
+def get_llm(
+    temperature: float = 0.7,
+    max_tokens: int = 2048,
+    cached: bool = False,
+    profile: str | None = None,
+) -> ChatOpenAI:
     """
     Return a configured LLM client connecting to our local vLLM instance.
+    Clients are cached per (model, generation settings) and share one connection pool.
+    Called inside a running event loop, the client and its async pool belong to that loop,
+    so async nodes must call get_llm() from the loop they await it in.
 
     Args:
         temperature: Creativity of the model (0.0 to 1.0).
                      Use 0.0 for extraction/critique, 0.7+ for writing.
+        max_tokens: Upper bound on generated tokens.
+        cached: Serve repeated identical prompts from the persistent response cache.
+                Only meaningful for low-temperature calls; ignored if llm_cache_enabled is off.
+        profile: Name of a generation profile in settings.llm_profiles ("editor", "writer", "critic").
+                 When given, it replaces temperature, max_tokens and cached and also sets
+                 the stop sequences and request timeout.
 
     """
-    return ChatOpenAI(
-        model=settings.model_name,
-        openai_api_key=settings.openai_api_key.get_secret_value(),
-        openai_api_base=settings.openai_api_base,
-        temperature=temperature,
-        max_tokens=2048,
-        stop=["<end_of_turn>", "<eos>"],
-    )
+    if profile is None:
+        generation = GenerationProfile(temperature=temperature, max_tokens=max_tokens, cached=cached)
+    elif profile in settings.llm_profiles:
+        generation = settings.llm_profiles[profile]
+    else:
+        raise ValueError(f"Unknown generation profile {profile!r}, expected one of {sorted(settings.llm_profiles)}")
+
+    if generation.cached and not settings.llm_cache_enabled:
+        generation = generation.model_copy(update={"cached": False})
+    key = (settings.model_name, generation)
+
+    loop = _running_loop()
+    with _registry_lock:
+        registry = _registry if loop is None else _loop_registries.setdefault(loop, {})
+        llm = registry.get(key)
+        if llm is None:
+            http_client, http_async_client = _http_clients(loop)
+            llm = ChatOpenAI(
+                model=settings.model_name,
+                openai_api_key=settings.openai_api_key.get_secret_value(),
+                openai_api_base=settings.openai_api_base,
+                temperature=generation.temperature,
+                max_tokens=generation.max_tokens,
+                stop=list(generation.stop),
+                timeout=generation.timeout or settings.llm_timeout,
+                max_retries=settings.llm_max_retries,
+                http_client=http_client,
+                http_async_client=http_async_client,
+                cache=_llm_response_cache() if generation.cached else None,
+            )
+            registry[key] = llm
+
+    return llm
+
+
+def llm_semaphore() -> asyncio.Semaphore:
+    """
+    Process-wide cap on in-flight async LLM requests (llm_max_concurrency), shared by all
+    concurrently running sessions. One semaphore per event loop, since asyncio primitives are loop-bound.
+    """
+    loop = asyncio.get_running_loop()
+    with _registry_lock:
+        semaphore = _semaphores.get(loop)
+        if semaphore is None:
+            semaphore = _semaphores[loop] = asyncio.Semaphore(settings.llm_max_concurrency)
+    return semaphore
+
+
+async def aclose_loop_clients() -> None:
+    """
+    Close the LLM clients, HTTP pool and semaphore of the running event loop.
+    Call it before the loop ends (e.g. at the end of an asyncio.run() session): pooled connections
+    reference their loop, so without this every finished loop would stay in memory.
+    """
+    loop = asyncio.get_running_loop()
+    with _registry_lock:
+        _loop_registries.pop(loop, None)
+        _semaphores.pop(loop, None)
+        async_client = _loop_http_async_clients.pop(loop, None)
+    if async_client is not None:
+        await async_client.aclose()
+
+
+async def abatch_limited(llm: BaseChatModel, inputs: list[Any]) -> list[Any]:
+    """
+    Send one request per input concurrently (vLLM batches them server-side), each holding one
+    llm_semaphore() slot. Like Runnable.abatch with return_exceptions=True: failures are returned in place.
+    """
+    semaphore = llm_semaphore()
+
+    async def call(prompt: Any) -> Any:
+        async with semaphore:
+            return await llm.ainvoke(prompt)
+
+    return await asyncio.gather(*(call(prompt) for prompt in inputs), return_exceptions=True)
+
+
+def with_json_schema(llm: ChatOpenAI, schema: type[BaseModel]) -> Runnable:
+    """
+    Constrain completions to schema through response_format json_schema, which vLLM enforces
+    with guided decoding: output always parses and respects constraints such as max_length.
+    Results are {"raw", "parsed", "parsing_error"} dicts, so token usage stays available.
+    Returns llm unchanged when llm_structured_output is off (free-form text, parsed by the caller).
+    """
+    if not settings.llm_structured_output:
+        return llm
+    return llm.with_structured_output(schema, method="json_schema", include_raw=True)
+
+
+def raw_message(result: BaseMessage | dict) -> BaseMessage:
+    """The model's message from a plain or with_json_schema() result."""
+    return result["raw"] if isinstance(result, dict) else result
+
+
+def parse_result(result: BaseMessage | dict, parser: PydanticOutputParser) -> BaseModel:
+    """The parsed model from a with_json_schema() result, or the free-form text parsed with parser."""
+    if not isinstance(result, dict):
+        return parser.parse(result.content)
+    if result.get("parsing_error") is not None:
+        raise result["parsing_error"]
+    if result.get("parsed") is None:
+        raise ValueError("Model returned no structured output")
+    return result["parsed"]
@@ -0,0 +1,92 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.messages import messages_from_dict, messages_to_dict
+from langchain_core.outputs import ChatGeneration
+
+from src.content_agents.core.logger import logger
+
+
+class PersistentLLMCache(BaseCache):
+    """
+    SQLite-backed LangChain cache for chat completions.
+
+    Keys are a hash of the serialized messages and LangChain's llm_string, which encodes the
+    model and its sampling parameters (temperature, max_tokens, stop, ...). Entries expire after
+    ttl_seconds, and the least recently used ones are evicted beyond max_entries.
+    Only worth enabling for (near-)deterministic calls such as the editor and critic.
+    """
+
+    def __init__(self, db_path: str = "data/cache/llm.db", ttl_seconds: float = 86400, max_entries: int = 1000) -> None:
+        self.db_path = Path(db_path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, generations TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)",
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed_at ON responses (accessed_at)")
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\x00{prompt}".encode()).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> RETURN_VAL_TYPE | None:
+        key = self._key(prompt, llm_string)
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute("SELECT generations, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+
+            generations, created_at = row
+            if now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+
+        logger.debug("LLM cache hit", key=key[:12])
+        return [ChatGeneration(message=message) for message in messages_from_dict(json.loads(generations))]
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        if not all(isinstance(gen, ChatGeneration) for gen in return_val):
+            return
+
+        key = self._key(prompt, llm_string)
+        payload = json.dumps(messages_to_dict([gen.message for gen in return_val]))
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, generations, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, payload, now, now),
+            )
+            self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries, then the least recently used ones above max_entries. Lock must be held."""
+        self._conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+
+        count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        if count > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY accessed_at LIMIT ?)",
+                (count - self.max_entries,),
+            )
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
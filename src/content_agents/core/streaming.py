@@ -0,0 +1,146 @@
+from contextlib import aclosing, closing
+from typing import Any, NamedTuple
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.runnables import Runnable
+
+ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+class JsonFieldStream:
+    """
+    Incremental scanner that follows one top-level string field of a JSON object while the
+    completion streams in, without waiting for (or requiring) a complete document.
+
+    feed() accepts arbitrary chunks. value holds the decoded field text received so far,
+    field_closed turns true once its closing quote arrives and object_closed once the
+    top-level object ends. Text before the object (e.g. a ```json fence) is ignored.
+    """
+
+    def __init__(self, field: str) -> None:
+        self.field = field
+        self.value = ""
+        self.field_closed = False
+        self.object_closed = False
+
+        self._depth = 0
+        self._in_string = False
+        self._escape = ""  # pending escape sequence, e.g. "\\" or "\\u00"
+        self._string = ""
+        self._expect_key = False
+        self._last_key: str | None = None
+        self._capturing = False
+
+    def feed(self, text: str) -> None:
+        for char in text:
+            if self.object_closed:
+                return
+            if self._in_string:
+                self._string_char(char)
+            else:
+                self._structural_char(char)
+
+    def _structural_char(self, char: str) -> None:
+        if char == '"':
+            self._in_string = True
+            self._string = ""
+            # A string value of the watched key at the top level is captured live.
+            self._capturing = self._depth == 1 and not self._expect_key and self._last_key == self.field
+        elif char in "{[":
+            self._depth += 1
+            self._expect_key = char == "{" and self._depth == 1
+        elif char in "}]":
+            self._depth -= 1
+            if self._depth == 0 and char == "}":
+                self.object_closed = True
+        elif char == "," and self._depth == 1:
+            self._expect_key = True
+            self._last_key = None
+
+    def _string_char(self, char: str) -> None:
+        if self._escape:
+            self._escape += char
+            if self._escape[1] == "u":
+                if len(self._escape) < 6:  # \uXXXX
+                    return
+                decoded = chr(int(self._escape[2:], 16))
+            else:
+                decoded = ESCAPES.get(char, char)
+            self._escape = ""
+            self._append(decoded)
+        elif char == "\\":
+            self._escape = char
+        elif char == '"':
+            self._in_string = False
+            if self._capturing:
+                self.field_closed = True
+                self._capturing = False
+            elif self._depth == 1 and self._expect_key:
+                self._last_key = self._string
+                self._expect_key = False
+        else:
+            self._append(char)
+
+    def _append(self, char: str) -> None:
+        buffer = self.value if self._capturing else self._string
+        if "\udc00" <= char <= "\udfff" and buffer and "\ud800" <= buffer[-1] <= "\udbff":
+            # Second half of an escaped surrogate pair (😀): merge into one code point.
+            buffer = buffer[:-1] + (buffer[-1] + char).encode("utf-16", "surrogatepass").decode("utf-16")
+        else:
+            buffer += char
+
+        if self._capturing:
+            self.value = buffer
+        else:
+            self._string = buffer
+
+
+class FieldStreamResult(NamedTuple):
+    text: str  # raw completion received before the stream ended or was aborted
+    value: str  # decoded value of the watched field so far
+    exceeded: bool  # generation was aborted because the value passed max_chars
+
+
+def _chunk_text(chunk: Any) -> str:
+    content = getattr(chunk, "content", chunk)
+    return content if isinstance(content, str) else ""
+
+
+def stream_json_field(llm: BaseChatModel | Runnable, prompt: Any, field: str, max_chars: int) -> FieldStreamResult:
+    """
+    Stream a JSON completion and stop reading as soon as the watched field passes max_chars
+    or the top-level object closes. Closing the stream closes the HTTP response, which
+    makes vLLM abort the request instead of decoding tokens nobody will read.
+    """
+    tracker = JsonFieldStream(field)
+    parts: list[str] = []
+
+    with closing(llm.stream(prompt)) as stream:
+        for chunk in stream:
+            text = _chunk_text(chunk)
+            parts.append(text)
+            tracker.feed(text)
+            if len(tracker.value) > max_chars:
+                return FieldStreamResult("".join(parts), tracker.value, exceeded=True)
+            if tracker.object_closed:
+                break
+
+    return FieldStreamResult("".join(parts), tracker.value, exceeded=False)
+
+
+async def astream_json_field(llm: BaseChatModel | Runnable, prompt: Any, field: str, max_chars: int) -> FieldStreamResult:
+    """Async variant of stream_json_field."""
+    tracker = JsonFieldStream(field)
+    parts: list[str] = []
+
+    async with aclosing(llm.astream(prompt)) as stream:
+        async for chunk in stream:
+            text = _chunk_text(chunk)
+            parts.append(text)
+            tracker.feed(text)
+            if len(tracker.value) > max_chars:
+                return FieldStreamResult("".join(parts), tracker.value, exceeded=True)
+            if tracker.object_closed:
+                break
+
+    return FieldStreamResult("".join(parts), tracker.value, exceeded=False)
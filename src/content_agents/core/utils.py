@@ -2,32 +2,103 @@ import base64
 
 import requests
 
+from src.content_agents.core.config import settings
 from src.content_agents.core.logger import logger
 
+# Rough average for English prose with Gemma/Llama-style tokenizers.
+CHARS_PER_TOKEN = 4
 
-def download_image_as_base64(url: str, timeout: int = 10) -> str | None:
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate used for prompt budgeting (no tokenizer round-trip)."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to roughly max_tokens, preferring a word boundary."""
+    marker = " [...]"
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+
+    cut = text[: max_chars - len(marker)]
+    last_space = cut.rfind(" ")
+    if last_space > len(cut) // 2:
+        cut = cut[:last_space]
+    return cut.rstrip() + marker
+
+
+def sniff_image_type(data: bytes) -> str | None:
+    """Identify an image format from its magic bytes. Returns the MIME type or None."""
+    if data.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if data.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if data.startswith((b"GIF87a", b"GIF89a")):
+        return "image/gif"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    if data.startswith(b"BM"):
+        return "image/bmp"
+    return None
+
+
+def download_image(url: str, timeout: int = 10, max_bytes: int | None = None) -> tuple[bytes, str] | None:
     """
-    Download an image from a URL and converts it to a base64 string.
-    Returns None if download fails (so the agent can continue with text only).
+    Download an image from a URL without ever buffering more than max_bytes.
+    Headers are checked before the body is read, the format is validated from magic bytes
+    as soon as the first chunk arrives, and the download aborts once the size cap is hit.
+    Returns (raw bytes, MIME type), or None if download fails (so the agent can continue with text only).
     """
     if not url:
         return None
 
+    max_bytes = max_bytes or settings.image_max_download_mb * 1024 * 1024
     headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
     }
 
     try:
-        response = requests.get(url, headers=headers, timeout=timeout)
-        response.raise_for_status()
+        with requests.get(url, headers=headers, timeout=timeout, stream=True) as response:
+            response.raise_for_status()
 
-        content_type = response.headers.get("Content-Type", "")
-        if "image" not in content_type:
-            logger.warning("URL is not an image", url=url, content_type=content_type)
+            content_type = response.headers.get("Content-Type", "")
+            if "image" not in content_type:
+                logger.warning("URL is not an image", url=url, content_type=content_type)
+                return None
+
+            content_length = response.headers.get("Content-Length", "")
+            if content_length.isdigit() and int(content_length) > max_bytes:
+                logger.warning("Image too large, skipped", url=url, size=int(content_length), limit=max_bytes)
+                return None
+
+            body = bytearray()
+            mime_type = None
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                body.extend(chunk)
+
+                if len(body) > max_bytes:
+                    logger.warning("Image exceeded size limit while downloading", url=url, limit=max_bytes)
+                    return None
+
+                if mime_type is None and len(body) >= 12:  # noqa: PLR2004
+                    mime_type = sniff_image_type(bytes(body[:12]))
+                    if mime_type is None:
+                        logger.warning("Unrecognized image format", url=url, content_type=content_type)
+                        return None
+
+        mime_type = mime_type or sniff_image_type(bytes(body))
+        if mime_type is None:
+            logger.warning("Unrecognized image format", url=url, content_type=content_type)
             return None
 
-        return base64.b64encode(response.content).decode("utf-8")
+        return bytes(body), mime_type
 
     except Exception as e:
         logger.warning("Failed to download image", url=url, error=str(e))
         return None
+
+
+def to_data_url(data: bytes, mime_type: str) -> str:
+    """Encode bytes as a base64 data URL for multimodal prompts."""
+    return f"data:{mime_type};base64,{base64.b64encode(data).decode('utf-8')}"
@@ -14,6 +14,10 @@ class AgentState(TypedDict):
     articles: list[NewsArticle]
     selected_article: NewsArticle | None
     draft: TweetDraft | None
+    # All drafts of the current writer round (best-of-N); the critic picks one of them as draft.
+    draft_candidates: list[TweetDraft]
     critique_history: Annotated[list[Critique], operator.add]
     iteration_count: int
     final_tweet_id: str | None
+    # Pre-fetched articles by rubric (daemon mode); the collector uses them instead of fetching.
+    article_index: dict[str, list[NewsArticle]] | None
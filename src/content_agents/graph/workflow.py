@@ -1,10 +1,10 @@
 from langgraph.graph import END, StateGraph
 
-from src.content_agents.agents.collector import collector_node
-from src.content_agents.agents.critic import critic_node
-from src.content_agents.agents.editor import editor_node
-from src.content_agents.agents.publisher import publisher_node
-from src.content_agents.agents.writer import writer_node
+from src.content_agents.agents.collector import acollector_node, collector_node
+from src.content_agents.agents.critic import acritic_node, critic_node
+from src.content_agents.agents.editor import aeditor_node, editor_node
+from src.content_agents.agents.publisher import apublisher_node, publisher_node
+from src.content_agents.agents.writer import awriter_node, writer_node
 from src.content_agents.core.logger import logger
 from src.content_agents.graph.state import AgentState
 
@@ -37,40 +37,65 @@ def should_publish(state: AgentState) -> str:
     return "end"
 
 
-workflow = StateGraph(AgentState)
-
-workflow.add_node("collector", collector_node)
-workflow.add_node("editor", editor_node)
-workflow.add_node("writer", writer_node)
-workflow.add_node("critic", critic_node)
-workflow.add_node("publisher", publisher_node)
-
-workflow.set_entry_point("collector")
-
-workflow.add_conditional_edges(
-    "collector",
-    check_news_availability,
-    {
-        "editor": "editor",
-        "collector": "collector",
-        "end": END,
-    },
-)
-
-workflow.add_edge("editor", "writer")
-workflow.add_edge("writer", "critic")
-
-workflow.add_conditional_edges(
-    "critic",
-    should_publish,
-    {
-        "writer": "writer",
-        "publisher": "publisher",
-        "end": END,
-        "critic": "critic",
-    },
-)
-
-workflow.add_edge("publisher", END)
-
-app = workflow.compile()
+SYNC_NODES = {
+    "collector": collector_node,
+    "editor": editor_node,
+    "writer": writer_node,
+    "critic": critic_node,
+    "publisher": publisher_node,
+}
+
+ASYNC_NODES = {
+    "collector": acollector_node,
+    "editor": aeditor_node,
+    "writer": awriter_node,
+    "critic": acritic_node,
+    "publisher": apublisher_node,
+}
+
+
+def build_workflow(async_nodes: bool = False) -> StateGraph:
+    """
+    Build the agent graph. With async_nodes, nodes await the LLM (ainvoke) and offload blocking
+    libraries to worker threads; such a graph must be run with ainvoke.
+    """
+    nodes = ASYNC_NODES if async_nodes else SYNC_NODES
+
+    workflow = StateGraph(AgentState)
+
+    for name, node in nodes.items():
+        workflow.add_node(name, node)
+
+    workflow.set_entry_point("collector")
+
+    workflow.add_conditional_edges(
+        "collector",
+        check_news_availability,
+        {
+            "editor": "editor",
+            "collector": "collector",
+            "end": END,
+        },
+    )
+
+    workflow.add_edge("editor", "writer")
+    workflow.add_edge("writer", "critic")
+
+    workflow.add_conditional_edges(
+        "critic",
+        should_publish,
+        {
+            "writer": "writer",
+            "publisher": "publisher",
+            "end": END,
+            "critic": "critic",
+        },
+    )
+
+    workflow.add_edge("publisher", END)
+
+    return workflow
+
+
+app = build_workflow().compile()
+async_app = build_workflow(async_nodes=True).compile()
@@ -1,27 +1,42 @@
 import argparse
-import time
+import asyncio
+from collections.abc import Awaitable
+from functools import partial
 
+import structlog
+
+from src.content_agents.core.llm import aclose_loop_clients
 from src.content_agents.core.logger import logger
-from src.content_agents.graph.workflow import app
+from src.content_agents.graph.workflow import async_app
+from src.content_agents.schemas.data_types import NewsArticle
+from src.content_agents.services.channel import Channel, default_channel, load_channels
+from src.content_agents.services.scheduler import FeedScheduler
 
 
-def run_once() -> None:
-    """Single execution of the agent workflow."""
+async def arun_once(article_index: dict[str, list[NewsArticle]] | None = None, channel: Channel | None = None) -> None:
+    """
+    Single execution of the agent workflow for one channel (the default channel if None).
+    With article_index, the collector skips fetching.
+    """
+    channel = channel or default_channel
+    structlog.contextvars.bind_contextvars(channel=channel.name)
     logger.info("🚀 Starting Autonomous Session")
 
     initial_state = {
         "topic": "",
         "articles": [],
         "draft": None,
+        "draft_candidates": [],
         "critique_history": [],
         "iteration_count": 0,
         "final_tweet_id": None,
         "tried_rubrics": [],
         "selected_article": None,
+        "article_index": article_index,
     }
 
     try:
-        final_state = app.invoke(initial_state)
+        final_state = await async_app.ainvoke(initial_state, config={"configurable": {"channel": channel}})
 
         if final_state.get("final_tweet_id"):
             logger.info("✅ Session finished. Tweet published.", id=final_state["final_tweet_id"])
@@ -32,21 +47,52 @@ def run_once() -> None:
         logger.exception("🔥 Critical error in agent loop", error=str(e))
 
 
+async def _run_session(session: Awaitable[None]) -> None:
+    """Await a session and release the event loop's LLM clients before asyncio.run() closes the loop."""
+    try:
+        await session
+    finally:
+        await aclose_loop_clients()
+
+
+def run_once(article_index: dict[str, list[NewsArticle]] | None = None) -> None:
+    """Blocking wrapper around arun_once for one-off runs. Each call runs in its own event loop."""
+    asyncio.run(_run_session(arun_once(article_index)))
+
+
+async def run_channels(channels: list[Channel], loop: bool, interval: float) -> None:
+    """
+    Run all channels concurrently in one event loop: one session each, or one scheduler each in loop mode.
+    LLM requests from all sessions share the llm_max_concurrency limit and the vLLM connection pool.
+    """
+    if not loop:
+        await asyncio.gather(*(arun_once(channel=channel) for channel in channels))
+        return
+
+    schedulers = [
+        FeedScheduler(
+            channel.news,
+            run_session=partial(arun_once, channel=channel),
+            publish_interval=channel.publish_interval or interval,
+        )
+        for channel in channels
+    ]
+    await asyncio.gather(*(scheduler.run() for scheduler in schedulers))
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Autonomous Content Agents")
     parser.add_argument("--loop", action="store_true", help="Run in continuous loop")
-    parser.add_argument("--interval", type=int, default=3600, help="Interval in seconds (default: 1 hour)")
+    parser.add_argument("--interval", type=int, default=3600, help="Publish interval in seconds (default: 1 hour)")
+    parser.add_argument("--channels", help="JSON file with channel definitions (default: single channel from settings)")
 
     args = parser.parse_args()
 
+    channels = load_channels(args.channels) if args.channels else [default_channel]
+
     if args.loop:
-        logger.info("Starting Daemon Mode", interval=args.interval)
-        while True:
-            run_once()
-            logger.info("Sleeping...", seconds=args.interval)
-            time.sleep(args.interval)
-    else:
-        run_once()
+        logger.info("Starting Daemon Mode", interval=args.interval, channels=[c.name for c in channels])
+    asyncio.run(_run_session(run_channels(channels, loop=args.loop, interval=args.interval)))
 
 
 if __name__ == "__main__":
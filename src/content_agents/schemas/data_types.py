@@ -10,10 +10,15 @@ class NewsArticle(BaseModel):
     source: str
     published_at: str
     image_url: str | None = None
+    # Other sources that ran the same story (cross-feed clustering); cluster_size counts all of them.
+    extra_sources: list[str] = Field(default_factory=list)
+    cluster_size: int = 1
 
     def to_markdown(self) -> str:
         """Format the prompt."""
         md = f"# {self.title}\n\nSource: {self.source}\nLink: {self.url}\n\n{self.content}"
+        if self.extra_sources:
+            md += f"\n\nAlso covered by: {', '.join(self.extra_sources)}"
         if self.image_url:
             md += f"\n\n![Image]({self.image_url})"
         return md
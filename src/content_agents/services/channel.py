@@ -0,0 +1,82 @@
+import json
+from pathlib import Path
+
+from langchain_core.runnables import RunnableConfig
+
+from src.content_agents.core.config import settings
+from src.content_agents.services.history import HistoryManager, history_service
+from src.content_agents.services.news_fetcher import NewsFetcherService, news_service
+from src.content_agents.services.story_index import StoryIndex
+from src.content_agents.services.twitter_client import TwitterClient, TwitterCredentials, twitter_service
+
+
+class Channel:
+    """
+    One content channel: its own sources, publication history and X account.
+
+    Channels run as separate graph sessions in one process and share everything that is
+    not channel-specific: the LLM client pool and concurrency limit, the feed cache and
+    feed stats (keyed by URL), and the image cache. Story clusters are per channel, so
+    cluster sizes only count the channel's own sources. Nodes look their channel up from
+    config["configurable"]["channel"] and fall back to the default channel.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        news: NewsFetcherService,
+        history: HistoryManager,
+        twitter: TwitterClient,
+        publish_interval: float | None = None,
+    ) -> None:
+        self.name = name
+        self.news = news
+        self.history = history
+        self.twitter = twitter
+        self.publish_interval = publish_interval
+
+    @classmethod
+    def from_config(cls, config: dict) -> "Channel":
+        """
+        Build a channel from one entry of the channels file:
+        {"name", "sources", "history_db", "credentials_prefix", "time_window_hours", "publish_interval"}.
+        Only "name" is required. An empty credentials_prefix uses the default X credentials.
+        """
+        name = config["name"]
+        time_window_hours = config.get("time_window_hours", 24)
+        news = NewsFetcherService(
+            config.get("sources", "data/sources.json"),
+            time_window_hours=time_window_hours,
+            feed_cache=news_service.feed_cache,
+            feed_stats=news_service.feed_stats,
+            story_index=StoryIndex(news_service.story_index.threshold, max_age_hours=time_window_hours)
+            if news_service.story_index is not None
+            else None,
+        )
+        history = HistoryManager(
+            config.get("history_db", f"data/history_{name}.db"),
+            legacy_file=None,
+            retention_hours=settings.history_retention_hours,
+            bloom_capacity=settings.history_bloom_capacity if settings.history_bloom_enabled else None,
+            max_fingerprint_distance=settings.dedup_max_fingerprint_distance,
+        )
+        prefix = config.get("credentials_prefix", "")
+        twitter = TwitterClient(TwitterCredentials.from_env(prefix) if prefix else None)
+
+        return cls(name, news, history, twitter, publish_interval=config.get("publish_interval"))
+
+
+def load_channels(path: str) -> list[Channel]:
+    """Load channel definitions from a JSON list (see Channel.from_config)."""
+    with open(Path(path), encoding="utf-8") as f:
+        return [Channel.from_config(entry) for entry in json.load(f)]
+
+
+def get_channel(config: RunnableConfig | None) -> Channel:
+    """Channel of the current graph run, or the default channel built from the module-level services."""
+    channel = ((config or {}).get("configurable") or {}).get("channel")
+    return channel or default_channel
+
+
+# Singleton: the single-channel setup that main.py ran before channels existed.
+default_channel = Channel("default", news_service, history_service, twitter_service)
@@ -0,0 +1,104 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import feedparser
+
+from src.content_agents.core.logger import logger
+
+# Entry fields the fetcher actually reads. Everything else is dropped to keep cache files small.
+CACHED_ENTRY_FIELDS = (
+    "title",
+    "link",
+    "summary",
+    "description",
+    "published",
+    "updated",
+    "published_parsed",
+    "updated_parsed",
+    "media_content",
+    "links",
+)
+STRUCT_TIME_FIELDS = ("published_parsed", "updated_parsed")
+
+
+class FeedCache:
+    """
+    Persistent on-disk cache of parsed RSS feeds, keyed by feed URL.
+    Stores HTTP validators (ETag / Last-Modified) next to the parsed entries,
+    so unchanged feeds can be revalidated with a conditional GET and served without re-parsing.
+    """
+
+    def __init__(self, cache_dir: str = "data/cache/feeds") -> None:
+        self.cache_dir = Path(cache_dir)
+
+    def _path(self, feed_url: str) -> Path:
+        digest = hashlib.sha256(feed_url.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{digest}.json"
+
+    def get(self, feed_url: str) -> dict | None:
+        """Return the cached record for a feed, or None if missing or unreadable."""
+        path = self._path(feed_url)
+        if not path.exists():
+            return None
+
+        try:
+            with open(path, encoding="utf-8") as f:
+                record = json.load(f)
+        except Exception as e:
+            logger.warning("Failed to read feed cache", url=feed_url, error=str(e))
+            return None
+
+        if record.get("url") != feed_url:
+            return None
+        return record
+
+    def store(self, feed_url: str, entries: list, etag: str | None = None, last_modified: str | None = None) -> None:
+        """Persist parsed entries and validators atomically (write to temp file, then rename)."""
+        record = {
+            "url": feed_url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": time.time(),
+            "entries": [{key: value for key, value in entry.items() if key in CACHED_ENTRY_FIELDS} for entry in entries],
+        }
+
+        tmp_path = None
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(record, f)
+            os.replace(tmp_path, self._path(feed_url))
+        except Exception as e:
+            logger.warning("Failed to write feed cache", url=feed_url, error=str(e))
+            if tmp_path:
+                Path(tmp_path).unlink(missing_ok=True)
+
+    @staticmethod
+    def conditional_headers(record: dict | None) -> dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers from a cached record."""
+        if not record:
+            return {}
+
+        headers = {}
+        if record.get("etag"):
+            headers["If-None-Match"] = record["etag"]
+        if record.get("last_modified"):
+            headers["If-Modified-Since"] = record["last_modified"]
+        return headers
+
+    @staticmethod
+    def entries(record: dict) -> list[feedparser.FeedParserDict]:
+        """Restore cached entries into the same shape feedparser produces."""
+        restored = []
+        for raw in record.get("entries", []):
+            entry = feedparser.FeedParserDict(raw)
+            for key in STRUCT_TIME_FIELDS:
+                if raw.get(key):  # the plain dict, FeedParserDict would alias updated_parsed -> published_parsed
+                    entry[key] = time.struct_time(raw[key])
+            restored.append(entry)
+        return restored
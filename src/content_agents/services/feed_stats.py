@@ -0,0 +1,148 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from src.content_agents.core.logger import logger
+
+# Weight of the newest inter-arrival gap in the moving average.
+EWMA_ALPHA = 0.3
+# Poll this many times per expected gap between entries.
+POLLS_PER_INTERVAL = 2
+# Caps the exponential backoff for idle and failing feeds (2**n).
+MAX_BACKOFF_EXPONENT = 6
+
+
+class FeedStats:
+    """
+    Small persisted store of per-feed publishing statistics, keyed by feed URL.
+
+    For every feed it tracks the newest entry seen, an exponentially weighted mean of the gap
+    between entries, and the consecutive idle polls and failures. From these it derives the
+    feed's next poll time:
+    - Active feeds are polled about twice per mean gap, within [min_interval, max_interval].
+    - Feeds that returned nothing new, or failed, back off exponentially up to max_interval.
+    - Feeds with a fixed "poll_minutes" keep that cadence.
+    """
+
+    def __init__(
+        self,
+        path: str = "data/feed_stats.json",
+        default_interval: float = 1800,
+        min_interval: float = 600,
+        max_interval: float = 86400,
+    ) -> None:
+        self.path = Path(path)
+        self.default_interval = default_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._lock = threading.Lock()
+        self._stats: dict[str, dict] = self._load()
+
+    def _load(self) -> dict[str, dict]:
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning("Failed to read feed stats, starting fresh", path=str(self.path), error=str(e))
+            return {}
+
+    def save(self) -> None:
+        """Persist all stats atomically (write to temp file, then rename)."""
+        with self._lock:
+            payload = json.dumps(self._stats, indent=2)
+
+        tmp_path = None
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning("Failed to write feed stats", path=str(self.path), error=str(e))
+            if tmp_path:
+                Path(tmp_path).unlink(missing_ok=True)
+
+    def get(self, feed_url: str) -> dict:
+        with self._lock:
+            return dict(self._stats.get(feed_url, {}))
+
+    def is_due(self, feed_url: str, now: float | None = None, tolerance: float = 1.0) -> bool:
+        """Whether the feed should be downloaded now. Feeds without stats are always due."""
+        now = time.time() if now is None else now
+        return self.get(feed_url).get("next_poll_at", 0.0) <= now + tolerance
+
+    def seconds_until_due(self, feed_url: str, now: float | None = None) -> float:
+        now = time.time() if now is None else now
+        return max(0.0, self.get(feed_url).get("next_poll_at", 0.0) - now)
+
+    def record_success(
+        self,
+        feed_url: str,
+        entry_dates: list[datetime],
+        now: float | None = None,
+        fixed_interval: float | None = None,
+    ) -> float:
+        """
+        Update stats after a successful download and schedule the next poll.
+        entry_dates are the publication dates of all dated entries in the feed.
+        Returns the delay until the next poll in seconds.
+        """
+        now = time.time() if now is None else now
+        timestamps = sorted(d.timestamp() for d in entry_dates)
+
+        with self._lock:
+            stat = self._stats.setdefault(feed_url, {})
+            last_entry_at = stat.get("last_entry_at")
+            mean_interval = stat.get("mean_interval")
+
+            if last_entry_at is None:
+                # Cold start: estimate the publishing rate from the entries the feed still lists.
+                if len(timestamps) > 1:
+                    mean_interval = (timestamps[-1] - timestamps[0]) / (len(timestamps) - 1)
+                new_entries = len(timestamps)
+            else:
+                new_timestamps = [ts for ts in timestamps if ts > last_entry_at]
+                previous = last_entry_at
+                for ts in new_timestamps:
+                    gap = ts - previous
+                    mean_interval = gap if mean_interval is None else EWMA_ALPHA * gap + (1 - EWMA_ALPHA) * mean_interval
+                    previous = ts
+                new_entries = len(new_timestamps)
+
+            if timestamps:
+                stat["last_entry_at"] = max(timestamps[-1], last_entry_at or 0.0)
+            stat["mean_interval"] = mean_interval
+            stat["idle_polls"] = 0 if new_entries else stat.get("idle_polls", 0) + 1
+            stat["failures"] = 0
+            stat["last_polled_at"] = now
+
+            if fixed_interval is not None:
+                delay = fixed_interval
+            else:
+                base = mean_interval / POLLS_PER_INTERVAL if mean_interval else self.default_interval
+                base = min(max(base, self.min_interval), self.max_interval)
+                delay = base * 2 ** min(stat["idle_polls"], MAX_BACKOFF_EXPONENT)
+            delay = min(delay, self.max_interval)
+            stat["next_poll_at"] = now + delay
+
+        return delay
+
+    def record_failure(self, feed_url: str, now: float | None = None) -> float:
+        """Count a failed download and back off exponentially. Returns the delay until the next poll."""
+        now = time.time() if now is None else now
+
+        with self._lock:
+            stat = self._stats.setdefault(feed_url, {})
+            stat["failures"] = stat.get("failures", 0) + 1
+            stat["last_polled_at"] = now
+            delay = min(self.min_interval * 2 ** min(stat["failures"] - 1, MAX_BACKOFF_EXPONENT), self.max_interval)
+            stat["next_poll_at"] = now + delay
+
+        return delay
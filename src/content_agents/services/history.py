@@ -1,49 +1,240 @@
 import json
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 
+from src.content_agents.core.bloom import BloomFilter
+from src.content_agents.core.config import settings
+from src.content_agents.core.dedup import SIMHASH_BANDS, canonicalize_url, content_fingerprint, hamming_distance, simhash_bands
 from src.content_agents.core.logger import logger
+from src.content_agents.schemas.data_types import NewsArticle
 
-HISTORY_FILE = Path("data/history.json")
+LEGACY_HISTORY_FILE = Path("data/history.json")
+
+
+def _to_signed(fingerprint: int) -> int:
+    """SQLite integers are signed 64-bit."""
+    return fingerprint - (1 << 64) if fingerprint >= 1 << 63 else fingerprint
+
+
+def _to_unsigned(fingerprint: int) -> int:
+    return fingerprint + (1 << 64) if fingerprint < 0 else fingerprint
 
 
 class HistoryManager:
-    def __init__(self) -> None:
-        self.processed_urls: set[str] = set()
-        self._load()
+    """
+    Persistent record of published article URLs, backed by SQLite.
+    Appends are single-row inserts and lookups go through the primary-key index,
+    so neither cost grows with the size of the history.
+
+    Entries older than retention_hours are evicted automatically, and an optional
+    in-memory Bloom filter answers the common "never seen" case without a query.
+
+    Deduplication works on canonical URLs (tracking params, fragments, 'www.' stripped)
+    plus a SimHash fingerprint of title+content, so syndicated copies of a published story
+    are caught before any LLM tokens are spent on them.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "data/history.db",
+        legacy_file: Path | None = LEGACY_HISTORY_FILE,
+        retention_hours: float | None = None,
+        bloom_capacity: int | None = None,
+        max_fingerprint_distance: int = 6,
+    ) -> None:
+        self.db_path = Path(db_path)
+        self.legacy_file = legacy_file
+        self.retention_hours = retention_hours
+        self.bloom_capacity = bloom_capacity
+        self.max_fingerprint_distance = min(max_fingerprint_distance, SIMHASH_BANDS - 1)
+        self._bloom: BloomFilter | None = None
+        self._fingerprint_index: dict[tuple[int, int], set[int]] = {}
+        self._indexes_built = False
+        self._last_eviction = 0.0
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._migrate()
+        self._evict_expired(force=True)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run statements atomically: either all of them land on disk or none do."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _migrate(self) -> None:
+        """Create or upgrade the schema. Tracked via SQLite's user_version pragma."""
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
 
-    def _load(self) -> None:
-        """Load processed URLs from disk."""
-        if not HISTORY_FILE.exists():
+        if version < 1:
+            with self._transaction() as conn:
+                conn.execute("CREATE TABLE IF NOT EXISTS history (url TEXT PRIMARY KEY, added_at REAL NOT NULL)")
+                self._import_legacy(conn)
+                conn.execute("PRAGMA user_version = 1")
+
+        if version < 2:  # noqa: PLR2004
+            with self._transaction() as conn:
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_history_added_at ON history (added_at)")
+                conn.execute("PRAGMA user_version = 2")
+
+        if version < 3:  # noqa: PLR2004
+            with self._transaction() as conn:
+                conn.execute("ALTER TABLE history ADD COLUMN canonical_url TEXT")
+                conn.execute("ALTER TABLE history ADD COLUMN fingerprint INTEGER")
+                rows = conn.execute("SELECT url FROM history").fetchall()
+                conn.executemany(
+                    "UPDATE history SET canonical_url = ? WHERE url = ?",
+                    [(canonicalize_url(url), url) for (url,) in rows],
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_history_canonical_url ON history (canonical_url)")
+                conn.execute("PRAGMA user_version = 3")
+
+    def _import_legacy(self, conn: sqlite3.Connection) -> None:
+        """One-time import of the old data/history.json format ({"urls": [...]})."""
+        if not self.legacy_file or not self.legacy_file.exists():
             return
 
         try:
-            with open(HISTORY_FILE, encoding="utf-8") as f:
-                data = json.load(f)
-                self.processed_urls = set(data.get("urls", []))
+            with open(self.legacy_file, encoding="utf-8") as f:
+                urls = json.load(f).get("urls", [])
         except Exception as e:
-            logger.warning("Failed to load history file", error=str(e))
+            logger.warning("Failed to load legacy history file", error=str(e))
+            return
 
-    def _save(self) -> None:
-        """Save current state to disk."""
-        HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
+        now = time.time()
+        conn.executemany("INSERT OR IGNORE INTO history (url, added_at) VALUES (?, ?)", [(url, now) for url in urls if url])
+        # canonical_url is backfilled by the next schema step.
+        logger.info("Migrated legacy history", count=len(urls), source=str(self.legacy_file))
 
-        try:
-            with open(HISTORY_FILE, "w", encoding="utf-8") as f:
-                json.dump({"urls": list(self.processed_urls)}, f, indent=2)
-        except Exception as e:
-            logger.error("Failed to save history", error=str(e))
+    def _cutoff(self) -> float:
+        """Oldest added_at timestamp that still counts as processed."""
+        if self.retention_hours is None:
+            return 0.0
+        return time.time() - self.retention_hours * 3600
+
+    def _evict_expired(self, force: bool = False) -> None:
+        """
+        Delete entries older than the retention window and rebuild the Bloom filter.
+        Runs at most once per hour unless forced.
+        """
+        now = time.time()
+        if not force and now - self._last_eviction < 3600:  # noqa: PLR2004
+            return
+        self._last_eviction = now
+
+        if self.retention_hours is not None:
+            with self._transaction() as conn:
+                evicted = conn.execute("DELETE FROM history WHERE added_at < ?", (self._cutoff(),)).rowcount
+            if evicted:
+                logger.info("Evicted expired history entries", count=evicted, retention_hours=self.retention_hours)
+        else:
+            evicted = 0
+
+        if evicted or not self._indexes_built:
+            self._rebuild_indexes()
+
+    def _rebuild_indexes(self) -> None:
+        """Rebuild the in-memory Bloom filter and fingerprint band index from the store."""
+        with self._lock:
+            rows = self._conn.execute("SELECT canonical_url, fingerprint FROM history").fetchall()
+
+            if self.bloom_capacity:
+                self._bloom = BloomFilter.from_items(
+                    (canonical for canonical, _ in rows if canonical),
+                    capacity=max(self.bloom_capacity, 2 * len(rows)),
+                )
+
+            self._fingerprint_index = {}
+            for _, fingerprint in rows:
+                if fingerprint is not None:
+                    self._index_fingerprint(_to_unsigned(fingerprint))
+
+            self._indexes_built = True
+
+    def _index_fingerprint(self, fingerprint: int) -> None:
+        for band in simhash_bands(fingerprint):
+            self._fingerprint_index.setdefault(band, set()).add(fingerprint)
 
     def is_processed(self, url: str) -> bool:
-        """Check if the URL has already been processed."""
-        return url in self.processed_urls
+        """Check if the URL (in canonical form) has already been processed within the retention window."""
+        self._evict_expired()
+        canonical = canonicalize_url(url)
+
+        if self._bloom is not None and canonical not in self._bloom:
+            return False
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM history WHERE canonical_url = ? AND added_at >= ?",
+                (canonical, self._cutoff()),
+            ).fetchone()
+        return row is not None
+
+    def is_near_duplicate(self, fingerprint: int) -> bool:
+        """Check whether a published story has a fingerprint within max_fingerprint_distance bits."""
+        with self._lock:
+            for band in simhash_bands(fingerprint):
+                for candidate in self._fingerprint_index.get(band, ()):
+                    if hamming_distance(candidate, fingerprint) <= self.max_fingerprint_distance:
+                        return True
+        return False
+
+    def is_duplicate(self, article: NewsArticle) -> bool:
+        """An article is a duplicate if its canonical URL or its content fingerprint was already published."""
+        if self.is_processed(article.url):
+            return True
+        return self.is_near_duplicate(content_fingerprint(article.title, article.content))
 
-    def add(self, url: str) -> None:
+    def add(self, url: str, fingerprint: int | None = None) -> None:
         """Mark a URL as processed and persists to disk."""
-        if url and url not in self.processed_urls:
-            self.processed_urls.add(url)
-            self._save()
+        if not url:
+            return
+
+        canonical = canonicalize_url(url)
+
+        try:
+            with self._transaction() as conn:
+                inserted = conn.execute(
+                    "INSERT OR IGNORE INTO history (url, added_at, canonical_url, fingerprint) VALUES (?, ?, ?, ?)",
+                    (url, time.time(), canonical, _to_signed(fingerprint) if fingerprint is not None else None),
+                ).rowcount
+        except sqlite3.Error as e:
+            logger.error("Failed to save history", error=str(e))
+            return
+
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(canonical)
+            if fingerprint is not None:
+                self._index_fingerprint(fingerprint)
+
+        if inserted:
             logger.info("URL added to history", url=url)
 
+        self._evict_expired()
+
+    def add_article(self, article: NewsArticle) -> None:
+        """Record a published article together with its content fingerprint."""
+        self.add(article.url, fingerprint=content_fingerprint(article.title, article.content))
+
 
 # Singleton
-history_service = HistoryManager()
+history_service = HistoryManager(
+    settings.history_db_path,
+    retention_hours=settings.history_retention_hours,
+    bloom_capacity=settings.history_bloom_capacity if settings.history_bloom_enabled else None,
+    max_fingerprint_distance=settings.dedup_max_fingerprint_distance,
+)
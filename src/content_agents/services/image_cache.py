@@ -0,0 +1,208 @@
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+from src.content_agents.core.config import settings
+from src.content_agents.core.logger import logger
+from src.content_agents.core.utils import download_image, to_data_url
+
+try:
+    from PIL import Image
+except ImportError:  # Declared dependency; if it is missing, images are cached as downloaded.
+    Image = None
+
+# Formats vLLM's vision preprocessing accepts directly.
+PASSTHROUGH_MIME_TYPES = {"image/jpeg", "image/png", "image/webp"}
+
+
+class ImageCache:
+    """
+    Content-addressed on-disk cache of prompt-ready images.
+
+    Each image is downloaded once, downscaled to max_dimension and re-encoded, then stored
+    under the SHA-256 of the processed bytes (blobs/). A small ref file per source URL (refs/)
+    points at the blob and keeps its real MIME type. Blobs are evicted least-recently-used
+    once the cache grows beyond max_bytes.
+
+    prefetch() starts downloads in the background (e.g. while the editor LLM call runs);
+    get_data_url() joins an in-flight download instead of starting a second one.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = "data/cache/images",
+        max_bytes: int = 200 * 1024 * 1024,
+        max_dimension: int = 1024,
+        jpeg_quality: int = 85,
+        prefetch_workers: int = 4,
+    ) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.max_dimension = max_dimension
+        self.jpeg_quality = jpeg_quality
+        self._executor = ThreadPoolExecutor(max_workers=prefetch_workers, thread_name_prefix="image-prefetch")
+        self._inflight: dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+        if Image is None:
+            logger.warning("Pillow is not installed: images are sent to the model without downscaling or re-encoding")
+
+    def _ref_path(self, url: str) -> Path:
+        return self.cache_dir / "refs" / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.cache_dir / "blobs" / digest
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    def _lookup(self, url: str) -> tuple[bytes, str] | None:
+        ref_path = self._ref_path(url)
+        if not ref_path.exists():
+            return None
+
+        try:
+            ref = json.loads(ref_path.read_text(encoding="utf-8"))
+            blob_path = self._blob_path(ref["blob"])
+            data = blob_path.read_bytes()
+            now = time.time()
+            os.utime(blob_path, (now, now))  # LRU bookkeeping
+        except (OSError, ValueError, KeyError):
+            return None
+
+        return data, ref["mime"]
+
+    def _prepare(self, data: bytes, mime_type: str) -> tuple[bytes, str]:
+        """Downscale and re-encode so the prompt carries no more pixels than the vision encoder uses."""
+        if Image is None:
+            return data, mime_type
+
+        with Image.open(io.BytesIO(data)) as img:
+            mime_type = Image.MIME.get(img.format, mime_type)
+            oversized = max(img.size) > self.max_dimension
+            if not oversized and mime_type in PASSTHROUGH_MIME_TYPES:
+                return data, mime_type
+
+            img.seek(0)  # first frame of animated images
+            has_alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+            img = img.convert("RGBA" if has_alpha else "RGB")
+            img.thumbnail((self.max_dimension, self.max_dimension), Image.Resampling.LANCZOS)
+
+            out = io.BytesIO()
+            if has_alpha:
+                img.save(out, format="PNG", optimize=True)
+                return out.getvalue(), "image/png"
+            img.save(out, format="JPEG", quality=self.jpeg_quality, optimize=True)
+            return out.getvalue(), "image/jpeg"
+
+    def _store(self, url: str, data: bytes, mime_type: str) -> None:
+        digest = hashlib.sha256(data).hexdigest()
+        blob_path = self._blob_path(digest)
+        if not blob_path.exists():
+            self._write_atomic(blob_path, data)
+
+        ref = json.dumps({"url": url, "blob": digest, "mime": mime_type}).encode("utf-8")
+        self._write_atomic(self._ref_path(url), ref)
+        self._evict()
+
+    def _evict(self) -> None:
+        """Delete least recently used blobs until the cache fits in max_bytes. Dangling refs are ignored on read."""
+        blobs = []
+        for path in (self.cache_dir / "blobs").glob("*"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if path.suffix != ".tmp":
+                blobs.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in blobs)
+        if total <= self.max_bytes:
+            return
+
+        for _, size, path in sorted(blobs):
+            path.unlink(missing_ok=True)
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def prefetch(self, urls: Iterable[str | None]) -> None:
+        """Start background downloads for images that are not cached or already in flight."""
+        for url in urls:
+            if not url:
+                continue
+            with self._lock:
+                if url in self._inflight:
+                    continue
+                future = self._executor.submit(self._fetch, url)
+                self._inflight[url] = future
+            future.add_done_callback(lambda _, url=url: self._forget(url))
+
+    def _forget(self, url: str) -> None:
+        with self._lock:
+            self._inflight.pop(url, None)
+
+    def get_data_url(self, url: str) -> str | None:
+        """Return the image at url as a base64 data URL with its real MIME type, downloading at most once."""
+        if not url:
+            return None
+
+        with self._lock:
+            future = self._inflight.get(url)
+        if future is not None:
+            logger.debug("Waiting for prefetched image", url=url)
+            return future.result()
+
+        return self._fetch(url)
+
+    def _fetch(self, url: str) -> str | None:
+        cached = self._lookup(url)
+        if cached:
+            logger.debug("Image cache hit", url=url)
+            return to_data_url(*cached)
+
+        downloaded = download_image(url)
+        if downloaded is None:
+            return None
+
+        raw, mime_type = downloaded
+        try:
+            data, mime_type = self._prepare(raw, mime_type)
+        except Exception as e:
+            logger.warning("Failed to decode image", url=url, error=str(e))
+            return None
+
+        logger.info("Image prepared for prompt", url=url, original_bytes=len(raw), prompt_bytes=len(data), mime=mime_type)
+
+        try:
+            self._store(url, data, mime_type)
+        except OSError as e:
+            logger.warning("Failed to write image cache", url=url, error=str(e))
+
+        return to_data_url(data, mime_type)
+
+
+# Singleton
+image_cache = ImageCache(
+    settings.image_cache_dir,
+    max_bytes=settings.image_cache_max_mb * 1024 * 1024,
+    max_dimension=settings.image_max_dimension,
+    jpeg_quality=settings.image_jpeg_quality,
+    prefetch_workers=settings.image_prefetch_workers,
+)
@@ -1,26 +1,88 @@
+import html
 import json
 import random
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime, timedelta
+from html.parser import HTMLParser
 from pathlib import Path
 
 import feedparser
-from bs4 import BeautifulSoup
+import requests
 from dateutil import parser as date_parser
 
+from src.content_agents.core.config import settings
 from src.content_agents.core.logger import logger
 from src.content_agents.schemas.data_types import NewsArticle
+from src.content_agents.services.feed_cache import FeedCache
+from src.content_agents.services.feed_stats import FeedStats
+from src.content_agents.services.story_index import StoryIndex
+
+FEED_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; AutonomousContentAgents/0.1; +https://github.com/pueraeternis/autonomous-content-agents)",
+}
+
+
+class _SummaryParser(HTMLParser):
+    """
+    Streaming extractor for entry summaries: collects text nodes and the first <img> src
+    without building a document tree. Output matches BeautifulSoup's get_text(separator="\n").
+    """
+
+    SKIPPED_TAGS = ("script", "style")
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.parts: list[str] = []
+        self.image_url: str | None = None
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag in self.SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag == "img" and self.image_url is None:
+            self.image_url = dict(attrs).get("src") or None
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in self.SKIPPED_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data: str) -> None:
+        if not self._skip_depth:
+            self.parts.append(data)
 
 
 class NewsFetcherService:
     """
     Service responsible for fetching, parsing, and cleaning news from RSS feeds.
     Includes logic for weighted rubric selection.
+    Feeds are downloaded concurrently on a bounded thread pool shared by all calls.
+    With a FeedCache attached, feeds are revalidated with conditional GETs.
+    With FeedStats as well, feeds are only downloaded when their adaptive poll time is due.
+    With a StoryIndex, articles on the same story from several feeds are returned as one.
     """
 
-    def __init__(self, sources_path: str = "data/sources.json", time_window_hours: int = 24) -> None:
+    def __init__(
+        self,
+        sources_path: str = "data/sources.json",
+        time_window_hours: int = 24,
+        fetch_timeout: float | None = None,
+        max_concurrency: int | None = None,
+        feed_cache: FeedCache | None = None,
+        feed_stats: FeedStats | None = None,
+        story_index: StoryIndex | None = None,
+    ) -> None:
         self.sources_path = Path(sources_path)
         self.time_window_hours = time_window_hours
+        self.fetch_timeout = fetch_timeout or settings.feed_fetch_timeout
+        self.feed_cache = feed_cache
+        self.feed_stats = feed_stats
+        self.story_index = story_index
         self._sources_cache = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency or settings.feed_max_concurrency,
+            thread_name_prefix="feed-fetch",
+        )
 
     def load_sources(self) -> list[dict]:
         """Load sources from JSON with caching."""
@@ -53,14 +115,23 @@ class NewsFetcherService:
         except IndexError:
             return None
 
-    def _clean_html(self, html_content: str) -> str:
-        """Remove HTML tags to save context window tokens."""
+    def _parse_summary(self, html_content: str) -> tuple[str, str | None]:
+        """
+        Single pass over an entry's summary HTML: returns plain text (tags removed to save
+        context window tokens) and the first <img> src. Plain-text summaries skip the HTML parser.
+        """
         if not html_content:
-            return ""
-        soup = BeautifulSoup(html_content, "html.parser")
-        return soup.get_text(separator="\n").strip()
+            return "", None
+
+        if "<" not in html_content:
+            return html.unescape(html_content).strip(), None
+
+        parser = _SummaryParser()
+        parser.feed(html_content)
+        parser.close()
+        return "\n".join(parser.parts).strip(), parser.image_url
 
-    def _extract_image(self, entry: dict) -> str | None:
+    def _extract_image(self, entry: dict, summary_image: str | None = None) -> str | None:
         """
         Attempt to find an image URL in RSS entry (media_content, enclosure, or summary).
         Crucial for Gemma 3 Multimodal capabilities.
@@ -77,75 +148,238 @@ class NewsFetcherService:
                 if link.get("rel") == "enclosure" and "image" in link.get("type", ""):
                     return link["href"]
 
-        # 3. Last resort: parse <img> tag from summary
-        if "summary" in entry:
-            soup = BeautifulSoup(entry["summary"], "html.parser")
-            img = soup.find("img")
-            if img and img.get("src"):
-                return img["src"]
+        # 3. Last resort: <img> tag found while parsing the summary
+        return summary_image
+
+    def _download_feed(self, feed_url: str) -> list[feedparser.FeedParserDict]:
+        """
+        Download and parse a single feed, returning its entries.
+        The whole download (not just each socket read) must finish within fetch_timeout.
+        If the feed is cached, a conditional GET is sent and a 304 is served from the cache without parsing.
+        """
+        record = self.feed_cache.get(feed_url) if self.feed_cache else None
+        request_headers = {**FEED_HEADERS, **FeedCache.conditional_headers(record)}
+        deadline = time.monotonic() + self.fetch_timeout
+
+        with requests.get(feed_url, headers=request_headers, timeout=self.fetch_timeout, stream=True) as response:
+            if response.status_code == 304 and record is not None:
+                logger.debug("Feed not modified, using cache", url=feed_url)
+                return FeedCache.entries(record)
 
+            response.raise_for_status()
+
+            chunks = []
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Feed download exceeded {self.fetch_timeout}s")
+                chunks.append(chunk)
+
+            headers = {key.lower(): value for key, value in response.headers.items()}
+            headers.setdefault("content-location", response.url)
+
+        feed = feedparser.parse(b"".join(chunks), response_headers=headers)
+
+        if self.feed_cache and (feed.entries or not feed.bozo):
+            self.feed_cache.store(
+                feed_url,
+                feed.entries,
+                etag=headers.get("etag"),
+                last_modified=headers.get("last-modified"),
+            )
+
+        return feed.entries
+
+    @staticmethod
+    def _parsed_entry_date(entry: feedparser.FeedParserDict) -> datetime | None:
+        """
+        Entry date from feedparser's pre-parsed UTC struct_time fields (published, then updated).
+        dict.get bypasses FeedParserDict's published -> updated key aliasing.
+        """
+        for field in ("published_parsed", "updated_parsed"):
+            parsed = dict.get(entry, field)
+            if parsed:
+                try:
+                    return datetime(*parsed[:6], tzinfo=UTC)
+                except (ValueError, TypeError, OverflowError):
+                    continue
         return None
 
-    def fetch_news_from_rubric(self, rubric: dict) -> list[NewsArticle]:
-        """Parse all feeds in the given rubric and filters by time."""
+    @staticmethod
+    def _fallback_entry_date(entry: feedparser.FeedParserDict) -> datetime | None:
+        """Slow path for dates feedparser could not parse: heuristic dateutil parsing of the raw strings."""
+        for field in ("published", "updated"):
+            raw = dict.get(entry, field)
+            if not raw:
+                continue
+            try:
+                published_at = date_parser.parse(raw)
+            except (ValueError, TypeError, OverflowError) as e:
+                logger.debug("Failed to parse entry date", field=field, error=str(e), raw=raw)
+                continue
+            if published_at.tzinfo is None:
+                published_at = published_at.replace(tzinfo=UTC)
+            return published_at
+        return None
+
+    def _load_entries(self, feed_url: str) -> tuple[list[feedparser.FeedParserDict], bool]:
+        """
+        Return a feed's entries and whether they were downloaded.
+        Feeds that are not due yet (per FeedStats) are served from the FeedCache without any request.
+        """
+        if self.feed_stats and self.feed_cache and not self.feed_stats.is_due(feed_url):
+            record = self.feed_cache.get(feed_url)
+            if record is not None:
+                logger.debug("Feed not due, serving from cache", url=feed_url)
+                return FeedCache.entries(record), False
+
+        return self._download_feed(feed_url), True
+
+    @staticmethod
+    def _fixed_interval(source: dict) -> float | None:
+        """Per-source poll cadence override ("poll_minutes" in sources.json), in seconds."""
+        return float(source["poll_minutes"]) * 60 if "poll_minutes" in source else None
+
+    def _fetch_source(self, source: dict, now: datetime) -> list[NewsArticle]:
+        """Fetch one feed and convert its fresh entries to articles. Never raises."""
         articles = []
-        now = datetime.now(UTC)
+        feed_url = source.get("feed")
+        source_name = source.get("title")
+        cutoff = now - timedelta(hours=self.time_window_hours)
+
+        try:
+            entries, downloaded = self._load_entries(feed_url)
+        except Exception as e:
+            logger.warning("Failed to fetch feed", source=source_name, error=str(e))
+            if self.feed_stats:
+                self.feed_stats.record_failure(feed_url)
+            return articles
+
+        try:
+            parsed_dates = [self._parsed_entry_date(entry) for entry in entries]
+            if downloaded and self.feed_stats:
+                self.feed_stats.record_success(
+                    feed_url,
+                    [d for d in parsed_dates if d],
+                    fixed_interval=self._fixed_interval(source),
+                )
+
+            # Stale feed: if every entry has a pre-parsed date and none is recent, skip the whole feed
+            # without falling back to dateutil or touching any HTML.
+            if parsed_dates and None not in parsed_dates and max(parsed_dates) < cutoff:
+                logger.debug("Feed has no recent entries", source=source_name, entries=len(entries))
+                return articles
+
+            for entry, parsed_date in zip(entries, parsed_dates, strict=True):
+                published_at = parsed_date or self._fallback_entry_date(entry)
 
-        for source in rubric.get("sources", []):
+                # Skip if no date or too old
+                if not published_at or published_at < cutoff:
+                    continue
+
+                # Extract content and inline image in one parse
+                content, summary_image = self._parse_summary(entry.get("summary", "") or entry.get("description", ""))
+
+                article = NewsArticle(
+                    title=entry.get("title", "No Title"),
+                    content=content[:5000],  # Limit content size
+                    url=entry.get("link", ""),
+                    source=source_name,
+                    published_at=published_at.isoformat(),
+                    image_url=self._extract_image(entry, summary_image),
+                )
+                articles.append(article)
+
+        except Exception as e:
+            logger.warning("Failed to parse feed", source=source_name, error=str(e))
+
+        return articles
+
+    def _fetch_feeds(self, sources: list[dict], now: datetime) -> dict[str, list[NewsArticle]]:
+        """Fetch sources in parallel, downloading each distinct feed URL only once."""
+        futures = {}
+        for source in sources:
             feed_url = source.get("feed")
-            source_name = source.get("title")
+            if feed_url not in futures:
+                futures[feed_url] = self._executor.submit(self._fetch_source, source, now)
 
-            try:
-                feed = feedparser.parse(feed_url)
-
-                for entry in feed.entries:
-                    # Parse date safely
-                    published_at = None
-                    # 1. Try 'published' field
-                    if "published" in entry:
-                        try:
-                            published_at = date_parser.parse(entry.published)
-                            if published_at.tzinfo is None:
-                                published_at = published_at.replace(tzinfo=UTC)
-                        except (ValueError, TypeError, OverflowError) as e:
-                            logger.debug("Failed to parse 'published' date", error=str(e), raw=entry.get("published"))
-
-                    # 2. Fallback to 'updated' field
-                    if not published_at and "updated" in entry:
-                        try:
-                            published_at = date_parser.parse(entry.updated)
-                            if published_at and published_at.tzinfo is None:
-                                published_at = published_at.replace(tzinfo=UTC)
-                        except (ValueError, TypeError, OverflowError) as e:
-                            logger.debug("Failed to parse 'updated' date", error=str(e), raw=entry.get("updated"))
-
-                    # Skip if no date or too old
-                    if not published_at:
-                        continue
-
-                    if (now - published_at) > timedelta(hours=self.time_window_hours):
-                        continue
-
-                    # Extract content
-                    content = self._clean_html(entry.get("summary", "") or entry.get("description", ""))
-
-                    article = NewsArticle(
-                        title=entry.get("title", "No Title"),
-                        content=content[:5000],  # Limit content size
-                        url=entry.get("link", ""),
-                        source=source_name,
-                        published_at=published_at.isoformat(),
-                        image_url=self._extract_image(entry),
-                    )
-                    articles.append(article)
-
-            except Exception as e:
-                logger.warning("Failed to fetch feed", source=source_name, error=str(e))
-                continue
+        results = {feed_url: future.result() for feed_url, future in futures.items()}
+        if self.feed_stats:
+            self.feed_stats.save()
+        if self.story_index is not None:
+            # Index while still off the event loop, merging later only looks clusters up.
+            self.story_index.add(article for articles in results.values() for article in articles)
+        return results
+
+    def merge_stories(self, index: dict[str, list[NewsArticle]]) -> dict[str, list[NewsArticle]]:
+        """
+        Collapse near-duplicate articles of an index by rubric into one story each (see StoryIndex).
+        Returns the index unchanged when story clustering is disabled.
+        """
+        if self.story_index is None:
+            return index
+        return self.story_index.merge_index(index)
+
+    def fetch_sources(self, sources: list[dict]) -> dict[str, list[NewsArticle]]:
+        """Fetch the given sources in parallel. Returns fresh articles indexed by feed URL."""
+        return self._fetch_feeds(sources, datetime.now(UTC))
+
+    def poll_interval(self, source: dict) -> float:
+        """
+        Seconds until a source should be polled again: the adaptive schedule from FeedStats
+        when enabled, otherwise the per-source "poll_minutes" override or the default cadence.
+        """
+        if self.feed_stats:
+            return self.feed_stats.seconds_until_due(source.get("feed"))
+        return self._fixed_interval(source) or settings.feed_poll_minutes * 60
+
+    def fetch_news_from_rubric(self, rubric: dict) -> list[NewsArticle]:
+        """
+        Parse all feeds in the given rubric concurrently and filter by time.
+        Articles keep the order of sources in the rubric, as with a sequential fetch.
+        """
+        sources = rubric.get("sources", [])
+        by_feed = self._fetch_feeds(sources, datetime.now(UTC))
+
+        articles = [article for source in sources for article in by_feed[source.get("feed")]]
+        articles = self.merge_stories({rubric["rubric"]: articles})[rubric["rubric"]]
 
         logger.info("Fetched articles", count=len(articles), rubric=rubric["rubric"])
         return articles
 
+    def fetch_all_rubrics(self, rubrics: list[dict]) -> dict[str, list[NewsArticle]]:
+        """
+        Fetch every rubric in a single parallel wave.
+        Feeds shared between rubrics are downloaded once.
+        Returns fresh articles indexed by rubric name, in source order.
+        """
+        all_sources = [source for rubric in rubrics for source in rubric.get("sources", [])]
+        by_feed = self._fetch_feeds(all_sources, datetime.now(UTC))
+
+        index = self.merge_stories(
+            {
+                rubric["rubric"]: [article for source in rubric.get("sources", []) for article in by_feed[source.get("feed")]]
+                for rubric in rubrics
+            }
+        )
+
+        logger.info(
+            "Fetched all rubrics",
+            feeds=len(by_feed),
+            articles={name: len(articles) for name, articles in index.items()},
+        )
+        return index
+
 
 # Singleton instance for ease of use
-news_service = NewsFetcherService()
+news_service = NewsFetcherService(
+    feed_cache=FeedCache(settings.feed_cache_dir) if settings.feed_cache_enabled else None,
+    feed_stats=FeedStats(
+        settings.feed_stats_path,
+        default_interval=settings.feed_poll_minutes * 60,
+        min_interval=settings.feed_poll_min_minutes * 60,
+        max_interval=settings.feed_poll_max_minutes * 60,
+    )
+    if settings.feed_stats_enabled
+    else None,
+    story_index=StoryIndex(settings.story_cluster_threshold) if settings.story_clustering_enabled else None,
+)
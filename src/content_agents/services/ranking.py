@@ -0,0 +1,145 @@
+import re
+from collections import defaultdict
+from datetime import UTC, datetime
+
+from src.content_agents.core.config import settings
+from src.content_agents.core.dedup import content_fingerprint, hamming_distance, simhash_bands
+from src.content_agents.schemas.data_types import NewsArticle
+
+# Share of each signal in the final score. Every signal is normalized to [0, 1].
+RECENCY_WEIGHT = 0.35
+SOURCE_WEIGHT = 0.2
+SALIENCE_WEIGHT = 0.25
+CLUSTER_WEIGHT = 0.2
+
+# Terms that usually mark a release, a result or a shake-up rather than marketing.
+DEFAULT_KEYWORDS = frozenset(
+    {
+        "launch", "launches", "release", "releases", "released", "introducing", "announces", "unveils",
+        "open-source", "open-weight", "weights", "model", "models", "benchmark", "state-of-the-art", "sota",
+        "paper", "agent", "agents", "reasoning", "multimodal", "acquires", "acquisition", "funding",
+        "lawsuit", "regulation", "breakthrough", "record",
+    }
+)  # fmt: skip
+# Keyword and entity hits at which salience saturates.
+SALIENCE_SATURATION = 6
+SALIENCE_CONTENT_CHARS = 500
+
+_TOKEN_RE = re.compile(r"[\w][\w.\-]*", re.UNICODE)
+
+
+def _is_entity(token: str) -> bool:
+    """
+    Model, product and company names: 'GPT-4o', 'Qwen2.5', 'H100', 'NVIDIA', 'OpenAI'.
+    Plain capitalized words are not counted, so Title Case headlines do not score higher.
+    """
+    if any(c.isdigit() for c in token) and any(c.isalpha() for c in token):
+        return True
+    return len(token) > 1 and (token.isupper() or any(c.isupper() for c in token[1:]))
+
+
+def source_weights(rubrics: list[dict]) -> dict[str, float]:
+    """Per-source weights from sources.json, keyed by source title. Sources without "weight" count 1.0."""
+    return {
+        source["title"]: float(source.get("weight", 1.0))
+        for rubric in rubrics
+        for source in rubric.get("sources", [])
+        if source.get("title")
+    }
+
+
+class ArticleRanker:
+    """
+    CPU-only scoring of candidate articles, used to shortlist what the editor LLM gets to see.
+
+    Each article gets a score from four signals:
+    - recency: halves every half_life_hours,
+    - source weight: the optional "weight" of its source in sources.json,
+    - salience: keywords (releases, results, deals) and named entities in the title and lead,
+    - cluster size: how many sources ran the same story, from cross-feed clustering (cluster_size)
+      or, for articles that were not clustered, near-duplicate fingerprints among the candidates.
+    """
+
+    def __init__(
+        self,
+        half_life_hours: float = 12.0,
+        max_fingerprint_distance: int = 6,
+        keywords: frozenset[str] = DEFAULT_KEYWORDS,
+    ) -> None:
+        self.half_life_hours = half_life_hours
+        self.max_fingerprint_distance = max_fingerprint_distance
+        self.keywords = keywords
+
+    def _recency(self, article: NewsArticle, now: datetime) -> float:
+        try:
+            published = datetime.fromisoformat(article.published_at)
+        except (TypeError, ValueError):
+            return 0.0
+        if published.tzinfo is None:
+            published = published.replace(tzinfo=UTC)
+        age_hours = max((now - published).total_seconds() / 3600, 0.0)
+        return 0.5 ** (age_hours / self.half_life_hours)
+
+    def _salience(self, article: NewsArticle) -> float:
+        title_tokens = _TOKEN_RE.findall(article.title)
+        lead_tokens = _TOKEN_RE.findall(article.content[:SALIENCE_CONTENT_CHARS])
+
+        keywords = {t.lower() for t in title_tokens + lead_tokens} & self.keywords
+        entities = {t for t in title_tokens if _is_entity(t)}
+        # Title keywords count double: the editor only ever sees the title.
+        title_keywords = {t.lower() for t in title_tokens} & self.keywords
+
+        return min((len(keywords) + len(title_keywords) + len(entities)) / SALIENCE_SATURATION, 1.0)
+
+    def _cluster_sizes(self, articles: list[NewsArticle]) -> list[int]:
+        """Number of candidates (including itself) within max_fingerprint_distance of each article."""
+        fingerprints = [content_fingerprint(a.title, a.content) for a in articles]
+        buckets: dict[tuple[int, int], list[int]] = defaultdict(list)
+        for i, fingerprint in enumerate(fingerprints):
+            for band in simhash_bands(fingerprint):
+                buckets[band].append(i)
+
+        sizes = []
+        for i, fingerprint in enumerate(fingerprints):
+            candidates = {j for band in simhash_bands(fingerprint) for j in buckets[band]}
+            sizes.append(
+                sum(hamming_distance(fingerprint, fingerprints[j]) <= self.max_fingerprint_distance for j in candidates)
+            )
+        return sizes
+
+    def scores(
+        self,
+        articles: list[NewsArticle],
+        weights: dict[str, float] | None = None,
+        now: datetime | None = None,
+    ) -> list[float]:
+        """Score of every article, in input order."""
+        now = now or datetime.now(UTC)
+        weights = weights or {}
+        max_weight = max([1.0, *weights.values()])
+
+        return [
+            RECENCY_WEIGHT * self._recency(article, now)
+            + SOURCE_WEIGHT * weights.get(article.source, 1.0) / max_weight
+            + SALIENCE_WEIGHT * self._salience(article)
+            + CLUSTER_WEIGHT * (1 - 1 / max(article.cluster_size, cluster_size))
+            for article, cluster_size in zip(articles, self._cluster_sizes(articles), strict=True)
+        ]
+
+    def rank(
+        self,
+        articles: list[NewsArticle],
+        weights: dict[str, float] | None = None,
+        now: datetime | None = None,
+    ) -> list[NewsArticle]:
+        """Articles sorted by descending score. Ties keep the input order."""
+        scores = self.scores(articles, weights, now)
+        order = sorted(range(len(articles)), key=lambda i: -scores[i])
+        return [articles[i] for i in order]
+
+
+# Singleton
+article_ranker = ArticleRanker(
+    half_life_hours=settings.ranking_half_life_hours,
+    max_fingerprint_distance=settings.dedup_max_fingerprint_distance,
+)
@@ -0,0 +1,130 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+
+from src.content_agents.core.logger import logger
+from src.content_agents.schemas.data_types import NewsArticle
+from src.content_agents.services.news_fetcher import NewsFetcherService
+
+ArticleIndex = dict[str, list[NewsArticle]]
+
+
+class FeedScheduler:
+    """
+    asyncio daemon that decouples feed I/O from publishing.
+
+    The poll loop refreshes each feed on its own cadence (NewsFetcherService.poll_interval, adaptive
+    when FeedStats is enabled) and keeps the latest fresh articles per feed: the ready queue. The
+    first round covers every feed; feeds that are not due yet are served from the feed cache.
+    The publish loop starts a session on a fixed cadence and hands it the ready queue indexed by
+    rubric, so the collector does not wait on any network I/O. Sessions run on the async graph in
+    the same event loop, and feed downloads run in worker threads, so feeds keep being polled
+    while a session waits on the LLM.
+
+    Publish slots are anchored to the start time rather than to the end of the previous session.
+    After an overrun, the next session starts immediately (one catch-up, no burst).
+    """
+
+    def __init__(
+        self,
+        fetcher: NewsFetcherService,
+        run_session: Callable[[ArticleIndex], Awaitable[None]],
+        publish_interval: float,
+    ) -> None:
+        self.fetcher = fetcher
+        self.run_session = run_session
+        self.publish_interval = publish_interval
+
+        self._rubrics = fetcher.load_sources()
+        self._sources = {s["feed"]: s for rubric in self._rubrics for s in rubric.get("sources", []) if s.get("feed")}
+        self._next_poll = dict.fromkeys(self._sources, 0.0)
+        self._ready: dict[str, list[NewsArticle]] = {}
+        self._primed = asyncio.Event()
+
+    def ready_index(self) -> ArticleIndex:
+        """
+        Ready articles indexed by rubric (same shape as fetch_all_rubrics), minus those that aged out,
+        with duplicate stories merged.
+        """
+        cutoff = datetime.now(UTC) - timedelta(hours=self.fetcher.time_window_hours)
+
+        def is_fresh(article: NewsArticle) -> bool:
+            try:
+                return datetime.fromisoformat(article.published_at) >= cutoff
+            except (TypeError, ValueError):
+                return False
+
+        return self.fetcher.merge_stories(
+            {
+                rubric["rubric"]: [
+                    article
+                    for source in rubric.get("sources", [])
+                    for article in self._ready.get(source.get("feed"), [])
+                    if is_fresh(article)
+                ]
+                for rubric in self._rubrics
+            }
+        )
+
+    async def poll_due(self) -> int:
+        """Poll every feed whose next poll time has passed. Returns the number of feeds polled."""
+        now = time.monotonic()
+        due = [self._sources[url] for url, at in self._next_poll.items() if at <= now]
+        if not due:
+            return 0
+
+        by_feed = await asyncio.to_thread(self.fetcher.fetch_sources, due)
+
+        polled_at = time.monotonic()
+        for source in due:
+            url = source["feed"]
+            self._ready[url] = by_feed.get(url, [])
+            self._next_poll[url] = polled_at + self.fetcher.poll_interval(source)
+
+        logger.info(
+            "Polled feeds",
+            feeds=len(due),
+            new_ready=sum(len(by_feed.get(s["feed"], [])) for s in due),
+            ready=sum(len(articles) for articles in self._ready.values()),
+        )
+        return len(due)
+
+    async def _poll_loop(self) -> None:
+        while True:
+            try:
+                await self.poll_due()
+            except Exception as e:
+                logger.exception("Feed polling failed", error=str(e))
+            self._primed.set()
+
+            delay = min(self._next_poll.values(), default=time.monotonic() + 60) - time.monotonic()
+            await asyncio.sleep(max(delay, 1.0))
+
+    async def _publish_loop(self) -> None:
+        await self._primed.wait()
+
+        next_run = time.monotonic()
+        while True:
+            index = self.ready_index()
+            if any(index.values()):
+                try:
+                    await self.run_session(index)
+                except Exception as e:
+                    logger.exception("Publish session failed", error=str(e))
+            else:
+                logger.info("Ready queue is empty, skipping publish slot")
+
+            next_run += self.publish_interval
+            now = time.monotonic()
+            if next_run < now:
+                logger.warning("Publish session overran its slot", overrun_seconds=round(now - next_run, 1))
+                next_run = now
+
+            logger.info("Next publish session scheduled", in_seconds=round(next_run - now))
+            await asyncio.sleep(next_run - now)
+
+    async def run(self) -> None:
+        """Run the poll and publish loops until cancelled."""
+        logger.info("Scheduler started", feeds=len(self._sources), publish_interval=self.publish_interval)
+        await asyncio.gather(self._poll_loop(), self._publish_loop())
@@ -0,0 +1,142 @@
+import threading
+import time
+from collections.abc import Iterable
+from datetime import datetime
+
+from src.content_agents.core.dedup import canonicalize_url, minhash, minhash_bands, minhash_similarity, shingles
+from src.content_agents.core.logger import logger
+from src.content_agents.schemas.data_types import NewsArticle
+
+# Word bigrams from the title and the lead: syndicated copies keep the lead, not the whole body.
+SHINGLE_SIZE = 2
+SHINGLE_WORDS = 120
+# 32 bands of 2 rows: pairs at Jaccard 0.3 become candidates ~95% of the time.
+LSH_BANDS = 32
+
+
+class StoryIndex:
+    """
+    Incremental MinHash-LSH index that groups near-duplicate articles across feeds and rubrics
+    into stories.
+
+    Every article (keyed by source and canonical URL) is indexed once. It joins the cluster of
+    its most similar indexed article if their estimated Jaccard similarity reaches threshold,
+    otherwise it starts a new cluster. Articles older than max_age_hours are dropped, so the
+    index only covers the fetcher's time window. Cluster size is the number of distinct sources
+    that ran the story and serves as a popularity signal.
+    """
+
+    def __init__(self, threshold: float = 0.3, max_age_hours: float = 24) -> None:
+        self.threshold = threshold
+        self.max_age_hours = max_age_hours
+        self._lock = threading.Lock()
+        self._signatures: dict[str, tuple[int, ...]] = {}
+        self._buckets: dict[tuple[int, tuple[int, ...]], set[str]] = {}
+        self._published: dict[str, float] = {}
+        self._sources: dict[str, str] = {}
+        self._cluster_of: dict[str, str] = {}
+        self._clusters: dict[str, list[str]] = {}
+
+    @staticmethod
+    def _key(article: NewsArticle) -> str:
+        return f"{article.source}\n{canonicalize_url(article.url)}"
+
+    @staticmethod
+    def _timestamp(article: NewsArticle) -> float:
+        try:
+            return datetime.fromisoformat(article.published_at).timestamp()
+        except (TypeError, ValueError):
+            return time.time()
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def add(self, articles: Iterable[NewsArticle]) -> None:
+        """Index articles that are not indexed yet and drop the ones that aged out."""
+        with self._lock:
+            new = {key: a for a in articles if (key := self._key(a)) not in self._signatures}
+        # Signatures are the expensive part, compute them outside the lock.
+        signed = [
+            (key, article, minhash(shingles(f"{article.title}\n{article.content}", SHINGLE_SIZE, SHINGLE_WORDS)))
+            for key, article in new.items()
+        ]
+
+        with self._lock:
+            for key, article, signature in signed:
+                if key not in self._signatures:
+                    self._insert(key, article, signature)
+            self._prune(time.time() - self.max_age_hours * 3600)
+
+    def _insert(self, key: str, article: NewsArticle, signature: tuple[int, ...]) -> None:
+        bands = minhash_bands(signature, LSH_BANDS)
+        candidates = {other for band in bands for other in self._buckets.get(band, ())}
+
+        best, best_similarity = None, self.threshold
+        for other in candidates:
+            similarity = minhash_similarity(signature, self._signatures[other])
+            if similarity >= best_similarity:
+                best, best_similarity = other, similarity
+
+        cluster = self._cluster_of[best] if best else key
+        self._cluster_of[key] = cluster
+        self._clusters.setdefault(cluster, []).append(key)
+        self._signatures[key] = signature
+        self._published[key] = self._timestamp(article)
+        self._sources[key] = article.source
+        for band in bands:
+            self._buckets.setdefault(band, set()).add(key)
+
+    def _prune(self, cutoff: float) -> None:
+        expired = [key for key, published in self._published.items() if published < cutoff]
+        for key in expired:
+            for band in minhash_bands(self._signatures.pop(key), LSH_BANDS):
+                bucket = self._buckets[band]
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band]
+            del self._published[key]
+            del self._sources[key]
+            cluster = self._cluster_of.pop(key)
+            self._clusters[cluster].remove(key)
+            if not self._clusters[cluster]:
+                del self._clusters[cluster]
+
+    def merge(self, articles: list[NewsArticle]) -> list[NewsArticle]:
+        """
+        Collapse articles on the same story into one entry, at the position of the first one.
+        The earliest published article represents the story; it lists the other sources of the
+        whole cluster (also those outside this list) in extra_sources and carries cluster_size.
+        """
+        self.add(articles)
+
+        groups: dict[str, list[NewsArticle]] = {}
+        with self._lock:
+            for article in articles:
+                cluster = self._cluster_of.get(self._key(article), self._key(article))
+                groups.setdefault(cluster, []).append(article)
+            story_sources = {
+                cluster: list(dict.fromkeys(self._sources[key] for key in self._clusters.get(cluster, [])))
+                for cluster in groups
+            }
+
+        merged = []
+        for cluster, members in groups.items():
+            representative = min(members, key=self._timestamp)
+            sources = story_sources[cluster] or [representative.source]
+            merged.append(
+                representative.model_copy(
+                    update={
+                        "extra_sources": [s for s in sources if s != representative.source],
+                        "cluster_size": len(sources),
+                    }
+                )
+            )
+
+        if len(merged) < len(articles):
+            logger.info("Merged duplicate stories", articles=len(articles), stories=len(merged))
+        return merged
+
+    def merge_index(self, index: dict[str, list[NewsArticle]]) -> dict[str, list[NewsArticle]]:
+        """merge() every rubric of an article index. Clusters span rubrics, so sizes count all of them."""
+        self.add(article for articles in index.values() for article in articles)
+        return {rubric: self.merge(articles) for rubric, articles in index.items()}
@@ -1,36 +1,70 @@
+import os
+
 import tweepy
+from dotenv import dotenv_values
+from pydantic import BaseModel, SecretStr
 
 from src.content_agents.core.config import settings
 from src.content_agents.core.logger import logger
 
 
+class TwitterCredentials(BaseModel):
+    """OAuth 1.0a user-context credentials for one X account."""
+
+    api_key: SecretStr | None = None
+    api_secret: SecretStr | None = None
+    access_token: SecretStr | None = None
+    access_secret: SecretStr | None = None
+
+    @classmethod
+    def from_settings(cls) -> "TwitterCredentials":
+        return cls(
+            api_key=settings.twitter_api_key,
+            api_secret=settings.twitter_api_secret,
+            access_token=settings.twitter_access_token,
+            access_secret=settings.twitter_access_secret,
+        )
+
+    @classmethod
+    def from_env(cls, prefix: str) -> "TwitterCredentials":
+        """Read <prefix>API_KEY, <prefix>API_KEY_SECRET, ... from the environment or .env (same names as the defaults)."""
+        env = {**dotenv_values(".env"), **os.environ}
+        return cls(
+            api_key=env.get(f"{prefix}API_KEY"),
+            api_secret=env.get(f"{prefix}API_KEY_SECRET"),
+            access_token=env.get(f"{prefix}ACCESS_TOKEN"),
+            access_secret=env.get(f"{prefix}ACCESS_TOKEN_SECRET"),
+        )
+
+    def is_complete(self) -> bool:
+        return bool(self.api_key and self.api_secret and self.access_token and self.access_secret)
+
+
 class TwitterClient:
     """
     Adapter for X (Twitter) API v2.
     Handles authentication and posting logic.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, credentials: TwitterCredentials | None = None) -> None:
         self.client = None
-        self._authenticate()
+        self._authenticate(credentials or TwitterCredentials.from_settings())
 
-    def _authenticate(self) -> None:
+    def _authenticate(self, credentials: TwitterCredentials) -> None:
         """
-        Authenticate using credentials from settings.
+        Authenticate using the given credentials (from settings by default).
         If credentials are valid, initializes the tweepy Client.
         """
-        if not (
-            settings.twitter_api_key and settings.twitter_api_secret and settings.twitter_access_token and settings.twitter_access_secret
-        ):
+        if not credentials.is_complete():
             logger.warning("Twitter credentials missing. Client remains inactive.")
             return
 
         try:
             self.client = tweepy.Client(
-                consumer_key=settings.twitter_api_key.get_secret_value(),
-                consumer_secret=settings.twitter_api_secret.get_secret_value(),
-                access_token=settings.twitter_access_token.get_secret_value(),
-                access_token_secret=settings.twitter_access_secret.get_secret_value(),
+                consumer_key=credentials.api_key.get_secret_value(),
+                consumer_secret=credentials.api_secret.get_secret_value(),
+                access_token=credentials.access_token.get_secret_value(),
+                access_token_secret=credentials.access_secret.get_secret_value(),
             )
             logger.info("Authenticated with Twitter API v2 successfully.")
 
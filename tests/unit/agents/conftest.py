@@ -0,0 +1,8 @@
+import pytest
+from pytest_mock import MockerFixture
+
+
+@pytest.fixture(autouse=True)
+def free_form_output(mocker: MockerFixture) -> None:
+    """Fake models in these tests return plain text; guided JSON decoding is covered in core/test_structured_output."""
+    mocker.patch("src.content_agents.core.llm.settings.llm_structured_output", False)
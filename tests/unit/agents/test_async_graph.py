@@ -0,0 +1,92 @@
+import asyncio
+import json
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from pytest_mock import MockerFixture
+
+from src.content_agents.graph.workflow import async_app
+from src.content_agents.schemas.data_types import NewsArticle
+from src.content_agents.services.channel import Channel
+
+
+def _fake_llm(*responses: dict) -> FakeListChatModel:
+    return FakeListChatModel(responses=[json.dumps(r) for r in responses])
+
+
+def _channel(mocker: MockerFixture, name: str) -> Channel:
+    channel = Channel(name, news=mocker.Mock(), history=mocker.Mock(), twitter=mocker.Mock())
+    channel.news.load_sources.return_value = [{"rubric": "AI", "sources": []}]
+    channel.history.is_duplicate.return_value = False
+    channel.twitter.post_tweet.return_value = f"{name}-tweet"
+    return channel
+
+
+def _initial_state(article: NewsArticle) -> dict:
+    return {
+        "topic": "",
+        "articles": [],
+        "draft": None,
+        "critique_history": [],
+        "iteration_count": 0,
+        "final_tweet_id": None,
+        "tried_rubrics": [],
+        "selected_article": None,
+        "article_index": {"AI": [article]},
+    }
+
+
+async def test_async_graph_runs_rewrite_loop_and_publishes(mocker: MockerFixture) -> None:
+    article = NewsArticle(title="New model", content="Details", url="https://example.com/1", source="Blog", published_at="2025-01-01")
+    channel = _channel(mocker, "ai")
+
+    mocker.patch("src.content_agents.agents.editor.get_llm", return_value=_fake_llm({"index": 0, "reasoning": "big"}))
+    mocker.patch(
+        "src.content_agents.agents.writer.get_llm",
+        return_value=_fake_llm({"content": "First try", "reasoning": "r"}, {"content": "Second try", "reasoning": "r"}),
+    )
+    mocker.patch(
+        "src.content_agents.agents.critic.get_llm",
+        return_value=_fake_llm(
+            {"score": 6, "feedback": "More detail", "is_approved": False},
+            {"score": 9, "feedback": "Good", "is_approved": True},
+        ),
+    )
+
+    final_state = await async_app.ainvoke(_initial_state(article), config={"configurable": {"channel": channel}})
+
+    assert final_state["final_tweet_id"] == "ai-tweet"
+    assert final_state["iteration_count"] == 1
+    assert channel.twitter.post_tweet.call_args.kwargs["text"] == "Second try"
+    channel.history.add_article.assert_called_once_with(article)
+
+
+async def test_concurrent_channels_share_llm_limit(mocker: MockerFixture) -> None:
+    """Each session publishes through its own channel while in-flight LLM calls stay under the shared cap."""
+    mocker.patch("src.content_agents.core.llm.settings.llm_max_concurrency", 2)
+    in_flight = peak = 0
+
+    class SlowLLM:
+        def __init__(self, response: dict) -> None:
+            self.response = json.dumps(response)
+
+        async def ainvoke(self, messages: list) -> object:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.02)
+            in_flight -= 1
+            return mocker.Mock(content=self.response, usage_metadata=None)
+
+    mocker.patch("src.content_agents.agents.editor.get_llm", return_value=SlowLLM({"index": 0, "reasoning": "r"}))
+    mocker.patch("src.content_agents.agents.writer.get_llm", return_value=SlowLLM({"content": "Tweet", "reasoning": "r"}))
+    mocker.patch("src.content_agents.agents.critic.get_llm", return_value=SlowLLM({"score": 9, "feedback": "ok", "is_approved": True}))
+
+    channels = [_channel(mocker, f"ch{i}") for i in range(5)]
+    article = NewsArticle(title="Story", content="Body", url="https://example.com/s", source="Blog", published_at="2025-01-01")
+
+    results = await asyncio.gather(
+        *(async_app.ainvoke(_initial_state(article), config={"configurable": {"channel": ch}}) for ch in channels),
+    )
+
+    assert [r["final_tweet_id"] for r in results] == [f"{ch.name}-tweet" for ch in channels]
+    assert peak == 2  # noqa: PLR2004
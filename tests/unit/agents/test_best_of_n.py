@@ -0,0 +1,44 @@
+import json
+
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.runnables import RunnableLambda
+from pytest_mock import MockerFixture
+
+from src.content_agents.agents.critic import critic_node
+from src.content_agents.agents.writer import writer_node
+from src.content_agents.schemas.data_types import NewsArticle, TweetDraft
+
+ARTICLE = NewsArticle(title="New model", content="Details", url="https://example.com/1", source="Blog", published_at="2025-01-01")
+
+
+def test_writer_returns_n_candidates(mocker: MockerFixture) -> None:
+    mocker.patch("src.content_agents.agents.writer.settings.writer_candidates", 3)
+    replies = iter(['{"content": "Draft A", "reasoning": "r"}', "not json", '{"content": "Draft C", "reasoning": "r"}'])
+    llm = RunnableLambda(lambda _: AIMessage(content=next(replies)))
+    mocker.patch("src.content_agents.agents.writer.get_llm", return_value=llm)
+
+    update = writer_node({"selected_article": ARTICLE, "critique_history": [], "iteration_count": 0})
+
+    assert sorted(d.content for d in update["draft_candidates"]) == ["Draft A", "Draft C"]
+    assert update["draft"] in update["draft_candidates"]
+
+
+def test_critic_reviews_candidates_in_one_batch_and_keeps_best(mocker: MockerFixture) -> None:
+    scores = {"okay": 7, "great": 9, "good": 8}
+
+    def review(messages: list[BaseMessage]) -> AIMessage:
+        draft = next(name for name in scores if f"DRAFT ---\n{name}\n" in messages[-1].content)
+        score = scores[draft]
+        return AIMessage(content=json.dumps({"score": score, "feedback": draft, "is_approved": score >= 8}))  # noqa: PLR2004
+
+    llm = RunnableLambda(review)
+    batch = mocker.spy(llm, "batch")
+    mocker.patch("src.content_agents.agents.critic.get_llm", return_value=llm)
+
+    candidates = [TweetDraft(content=name, reasoning="r") for name in [*scores, "x" * 400]]
+    update = critic_node({"draft": candidates[0], "draft_candidates": candidates, "selected_article": ARTICLE, "articles": [ARTICLE]})
+
+    assert update["draft"].content == "great"
+    assert update["critique_history"][0].score == 9  # noqa: PLR2004
+    assert batch.call_count == 1
+    assert len(batch.call_args.args[0]) == 3  # over-long draft rejected without the LLM  # noqa: PLR2004
@@ -0,0 +1,56 @@
+from src.content_agents.agents.critic import _build_source_context
+from src.content_agents.core.utils import estimate_tokens
+from src.content_agents.schemas.data_types import NewsArticle
+
+
+def _article(i: int, content: str) -> NewsArticle:
+    return NewsArticle(title=f"Story {i}", content=content, url=f"https://example.com/{i}", source="Blog", published_at="2025-12-09")
+
+
+def test_context_keeps_selected_article_and_respects_budget() -> None:
+    articles = [_article(i, "word " * 1000) for i in range(20)]
+    selected = articles[5]
+
+    context = _build_source_context(selected, articles, budget_tokens=1500)
+
+    assert context.startswith("# Story 5")
+    assert "RELATED COVERAGE" in context
+    assert "Story 0" in context
+    assert estimate_tokens(context) <= 1500  # noqa: PLR2004
+    assert "Story 19" not in context
+
+
+def test_oversized_selected_article_is_truncated() -> None:
+    selected = _article(0, "word " * 10_000)
+
+    context = _build_source_context(selected, [selected], budget_tokens=500)
+
+    assert estimate_tokens(context) <= 500  # noqa: PLR2004
+    assert context.endswith("[...]")
+
+
+def test_related_coverage_is_chosen_by_similarity() -> None:
+    selected = NewsArticle(
+        title="Google releases Gemma 3",
+        content="Google released Gemma 3, a family of open multimodal models ranging from 1B to 27B parameters. "
+        "The models support a 128k context window, function calling and over 140 languages.",
+        url="https://blog.google/gemma-3",
+        source="Google",
+        published_at="2025-12-09",
+    )
+    unrelated = _article(1, "Data center revenue grew again this quarter as demand for accelerators stays strong.")
+    same_story = NewsArticle(
+        title="Gemma 3 is out: Google open models",
+        content="Google today launched Gemma 3, its new open model family from 1B to 27B parameters "
+        "with a 128k context window and support for 140 languages and function calling.",
+        url="https://news.example.com/gemma",
+        source="Newsletter",
+        published_at="2025-12-09",
+    )
+
+    context = _build_source_context(selected, [unrelated, selected, same_story], budget_tokens=1500)
+    assert "Gemma 3 is out" in context
+    assert "Story 1" not in context
+
+    context = _build_source_context(selected, [unrelated, selected], budget_tokens=1500)
+    assert "RELATED COVERAGE" not in context
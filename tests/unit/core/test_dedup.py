@@ -0,0 +1,38 @@
+from src.content_agents.core.dedup import (
+    canonicalize_url,
+    content_fingerprint,
+    hamming_distance,
+    minhash,
+    minhash_similarity,
+    shingles,
+)
+
+
+def test_canonical_url_strips_tracking_and_noise() -> None:
+    expected = "https://example.com/blog/post?id=7&page=2"
+
+    assert canonicalize_url("http://www.Example.com/blog/post/?page=2&utm_source=x&id=7#comments") == expected
+    assert canonicalize_url("https://example.com:443/blog//post?id=7&page=2&fbclid=abc") == expected
+
+
+def test_fingerprint_separates_near_duplicates_from_other_stories() -> None:
+    body = (
+        "Google released Gemma 3, a family of open multimodal models ranging from 1B to 27B parameters. "
+        "The models support a 128k context window, function calling and over 140 languages, "
+        "and the 27B variant fits on a single accelerator."
+    )
+    original = content_fingerprint("Google releases Gemma 3", body)
+    syndicated = content_fingerprint("Google releases Gemma 3", body + " Read more on our blog.")
+    unrelated = content_fingerprint("NVIDIA posts record earnings", "Data center revenue grew again this quarter.")
+
+    assert hamming_distance(original, syndicated) <= 6  # noqa: PLR2004
+    assert hamming_distance(original, unrelated) > 6  # noqa: PLR2004
+
+
+def test_minhash_estimates_jaccard_similarity() -> None:
+    base = shingles("the quick brown fox jumps over the lazy dog near the river bank today")
+    similar = shingles("the quick brown fox jumps over the lazy dog near the river bank tonight")
+    unrelated = shingles("quarterly earnings beat expectations as data center revenue grew")
+
+    assert minhash_similarity(minhash(base), minhash(similar)) > 0.7  # noqa: PLR2004
+    assert minhash_similarity(minhash(base), minhash(unrelated)) < 0.2  # noqa: PLR2004
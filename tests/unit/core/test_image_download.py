@@ -0,0 +1,67 @@
+from collections.abc import Iterable
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from src.content_agents.core.utils import download_image, sniff_image_type
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 100
+
+
+def _response(mocker: MockerFixture, headers: dict, chunks: Iterable[bytes]) -> MagicMock:
+    response = mocker.MagicMock(headers=headers)
+    response.__enter__.return_value = response
+    response.iter_content.return_value = iter(chunks)
+    mocker.patch("src.content_agents.core.utils.requests.get", return_value=response)
+    return response
+
+
+@pytest.mark.parametrize(
+    ("data", "expected"),
+    [
+        (b"\xff\xd8\xff\xe0" + b"\x00" * 8, "image/jpeg"),
+        (PNG, "image/png"),
+        (b"GIF89a" + b"\x00" * 6, "image/gif"),
+        (b"RIFF\x00\x00\x00\x00WEBPVP8 ", "image/webp"),
+        (b"<!DOCTYPE html>", None),
+    ],
+)
+def test_sniff_image_type(data: bytes, expected: str | None) -> None:
+    assert sniff_image_type(data) == expected
+
+
+def test_valid_image_is_downloaded_with_sniffed_mime(mocker: MockerFixture) -> None:
+    _response(mocker, {"Content-Type": "image/jpeg"}, [PNG[:8], PNG[8:]])
+
+    assert download_image("https://example.com/img") == (PNG, "image/png")
+
+
+def test_non_image_content_type_is_rejected_before_reading(mocker: MockerFixture) -> None:
+    response = _response(mocker, {"Content-Type": "video/mp4"}, [b"\x00" * 1024])
+
+    assert download_image("https://example.com/video") is None
+    response.iter_content.assert_not_called()
+
+
+def test_declared_oversize_is_rejected_before_reading(mocker: MockerFixture) -> None:
+    response = _response(mocker, {"Content-Type": "image/png", "Content-Length": "5000"}, [PNG])
+
+    assert download_image("https://example.com/big", max_bytes=1000) is None
+    response.iter_content.assert_not_called()
+
+
+def test_stream_aborts_when_size_cap_is_exceeded(mocker: MockerFixture) -> None:
+    chunks = iter([PNG] + [b"\x00" * 500] * 1000)
+    _response(mocker, {"Content-Type": "image/png"}, chunks)
+
+    assert download_image("https://example.com/endless", max_bytes=1000) is None
+    assert len(list(chunks)) > 990  # noqa: PLR2004
+
+
+def test_html_served_as_image_is_rejected_after_first_chunk(mocker: MockerFixture) -> None:
+    chunks = iter([b"<html><body>Not found</body></html>", b"more"])
+    _response(mocker, {"Content-Type": "image/png"}, chunks)
+
+    assert download_image("https://example.com/fake") is None
+    assert list(chunks) == [b"more"]
@@ -0,0 +1,40 @@
+import time
+from pathlib import Path
+
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration
+
+from src.content_agents.core.llm_cache import PersistentLLMCache
+
+
+def _generation(text: str) -> list[ChatGeneration]:
+    return [ChatGeneration(message=AIMessage(content=text))]
+
+
+def test_cache_roundtrip_is_keyed_by_prompt_and_params(tmp_path: Path) -> None:
+    cache = PersistentLLMCache(str(tmp_path / "llm.db"))
+    cache.update("prompt", "model=a,temperature=0.0", _generation('{"score": 9}'))
+
+    hit = cache.lookup("prompt", "model=a,temperature=0.0")
+
+    assert hit is not None
+    assert hit[0].message.content == '{"score": 9}'
+    assert cache.lookup("prompt", "model=a,temperature=0.7") is None
+    assert cache.lookup("other prompt", "model=a,temperature=0.0") is None
+
+
+def test_cache_expires_and_evicts_least_recently_used(tmp_path: Path) -> None:
+    cache = PersistentLLMCache(str(tmp_path / "llm.db"), ttl_seconds=60, max_entries=2)
+    cache.update("a", "llm", _generation("A"))
+    cache.update("b", "llm", _generation("B"))
+    time.sleep(0.01)
+    cache.lookup("a", "llm")  # "b" is now least recently used
+    cache.update("c", "llm", _generation("C"))
+
+    assert cache.lookup("a", "llm") is not None
+    assert cache.lookup("b", "llm") is None
+    assert cache.lookup("c", "llm") is not None
+
+    cache.ttl_seconds = 0
+    time.sleep(0.01)
+    assert cache.lookup("c", "llm") is None
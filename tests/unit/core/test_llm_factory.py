@@ -1,5 +1,51 @@
-from src.content_agents.core.config import settings
-from src.content_agents.core.llm import get_llm
+import asyncio
+import json
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.content_agents.core.config import DEFAULT_GENERATION_PROFILES, Settings, settings
+from src.content_agents.core.llm import aclose_loop_clients, get_llm
+
+
+class _CompletionHandler(BaseHTTPRequestHandler):
+    """Minimal OpenAI-compatible endpoint that keeps connections alive, like vLLM."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers["Content-Length"]))
+        body = json.dumps(
+            {
+                "id": "cmpl-1",
+                "object": "chat.completion",
+                "created": 0,
+                "model": settings.model_name,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": "ok"}, "finish_reason": "stop"}],
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def keepalive_server(monkeypatch: pytest.MonkeyPatch) -> Iterator[str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _CompletionHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(settings, "openai_api_base", f"http://127.0.0.1:{server.server_address[1]}/v1")
+    monkeypatch.setattr(settings, "llm_max_retries", 0)
+    yield settings.openai_api_base
+    server.shutdown()
+    server.server_close()
 
 
 def test_llm_factory_configuration() -> None:
@@ -27,3 +73,68 @@ def test_llm_factory_override() -> None:
 
     assert llm.temperature == custom_temp
     assert llm.model_name == settings.model_name
+
+
+def test_llm_factory_reuses_clients() -> None:
+    """Same parameters return the cached client; all clients share one HTTP pool."""
+    writer = get_llm(temperature=0.7)
+    critic = get_llm(temperature=0.0)
+
+    assert get_llm(temperature=0.7) is writer
+    assert critic is not writer
+    assert critic.http_client is writer.http_client
+
+
+def test_llm_factory_profiles() -> None:
+    """Named profiles set per-node budgets, stop sequences and timeouts."""
+    editor = get_llm(profile="editor")
+    profile = settings.llm_profiles["editor"]
+
+    assert editor.max_tokens == profile.max_tokens
+    assert editor.temperature == profile.temperature
+    assert editor.stop == list(profile.stop)
+    assert editor.request_timeout == profile.timeout
+    assert get_llm(profile="editor") is editor
+    assert get_llm(profile="writer").max_tokens < 2048  # noqa: PLR2004
+
+
+def test_llm_factory_unknown_profile() -> None:
+    with pytest.raises(ValueError, match="Unknown generation profile"):
+        get_llm(profile="translator")
+
+
+def test_llm_profiles_override_merges_defaults(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Overriding one profile from the environment keeps the other defaults."""
+    monkeypatch.setenv("LLM_PROFILES", '{"writer": {"temperature": 0.9, "max_tokens": 400}}')
+    profiles = Settings().llm_profiles
+
+    assert profiles["writer"].max_tokens == 400  # noqa: PLR2004
+    assert profiles["editor"] == DEFAULT_GENERATION_PROFILES["editor"]
+
+
+def test_llm_factory_survives_consecutive_event_loops(keepalive_server: str) -> None:
+    """Each asyncio.run() session gets its own async pool, so kept-alive connections never outlive their loop."""
+    clients = []
+
+    async def session() -> str:
+        llm = get_llm(temperature=0.3)
+        clients.append(llm)
+        assert get_llm(temperature=0.3) is llm
+        try:
+            return (await llm.ainvoke("ping")).content
+        finally:
+            await aclose_loop_clients()
+
+    assert asyncio.run(session()) == "ok"
+    assert asyncio.run(session()) == "ok"
+    assert clients[0] is not clients[1]
+    assert clients[0].http_async_client is not clients[1].http_async_client
+
+
+def test_llm_profiles_override_keeps_unset_fields(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Changing one budget must not reset the profile's temperature, cache or timeout."""
+    monkeypatch.setenv("LLM_PROFILES", '{"critic": {"max_tokens": 500}}')
+    critic = Settings().llm_profiles["critic"]
+
+    assert critic.max_tokens == 500  # noqa: PLR2004
+    assert critic == DEFAULT_GENERATION_PROFILES["critic"].model_copy(update={"max_tokens": 500})
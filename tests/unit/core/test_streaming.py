@@ -0,0 +1,67 @@
+import json
+
+import httpx
+import pytest
+from langchain_openai import ChatOpenAI
+from pytest_mock import MockerFixture
+
+from src.content_agents.agents.writer import DraftOutput, _parse_draft, _stream_draft
+from src.content_agents.core.streaming import JsonFieldStream, stream_json_field
+from src.content_agents.schemas.data_types import NewsArticle
+
+ARTICLE = NewsArticle(title="T", content="C", url="https://example.com", source="S", published_at="2025-01-01")
+
+
+def _streaming_llm(tokens: list[str], served: list[int]) -> ChatOpenAI:
+    """ChatOpenAI on an in-process SSE transport; served records how many token events were produced."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        def events():  # noqa: ANN202
+            for token in tokens:
+                served.append(1)
+                chunk = {"id": "c", "object": "chat.completion.chunk", "created": 0, "model": "m", "choices": [{"index": 0, "delta": {"content": token}}]}
+                yield f"data: {json.dumps(chunk)}\n\n".encode()
+            yield b"data: [DONE]\n\n"
+
+        return httpx.Response(200, headers={"content-type": "text/event-stream"}, content=events())
+
+    return ChatOpenAI(model="m", api_key="key", base_url="http://vllm/v1", http_client=httpx.Client(transport=httpx.MockTransport(handler)))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 4, 64])
+def test_field_is_decoded_incrementally(chunk_size: int) -> None:
+    document = "```json\n" + json.dumps(
+        {"reasoning": 'mentions "content": here', "meta": {"content": "nested"}, "content": 'Say "hi"\n😀', "n": 1},
+        ensure_ascii=True,
+    )
+    tracker = JsonFieldStream("content")
+
+    for start in range(0, len(document), chunk_size):
+        tracker.feed(document[start : start + chunk_size])
+
+    assert tracker.value == 'Say "hi"\n😀'
+    assert tracker.field_closed
+    assert tracker.object_closed
+
+
+def test_runaway_draft_is_aborted_at_the_limit(mocker: MockerFixture) -> None:
+    mocker.patch("src.content_agents.agents.writer.settings.twitter_max_length", 50)
+    served: list[int] = []
+    tokens = ['{"content": "', *["word "] * 200, '", "reasoning": "r"}']
+
+    result = _stream_draft(_streaming_llm(tokens, served), [])
+    draft = _parse_draft(result, ARTICLE, None)
+
+    assert 50 < len(draft.content) <= 55  # cut at the first chunk past the limit  # noqa: PLR2004
+    assert len(served) < len(tokens) / 2
+
+
+def test_stream_stops_when_object_closes() -> None:
+    served: list[int] = []
+    tokens = ['{"content": "Short", ', '"reasoning": "r"}', *[" trailing"] * 50]
+
+    result = stream_json_field(_streaming_llm(tokens, served).bind(response_format=DraftOutput), [], "content", 280)
+
+    assert not result.exceeded
+    assert json.loads(result.text) == {"content": "Short", "reasoning": "r"}
+    assert len(served) < len(tokens) / 2
@@ -0,0 +1,60 @@
+import json
+
+import httpx
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.output_parsers import PydanticOutputParser
+from langchain_openai import ChatOpenAI
+
+from src.content_agents.agents.editor import EditorSelection, _selection_schema
+from src.content_agents.agents.writer import DraftOutput
+from src.content_agents.core.config import settings
+from src.content_agents.core.llm import parse_result, with_json_schema
+
+
+def _llm_with_reply(content: str, requests: list[dict]) -> ChatOpenAI:
+    """ChatOpenAI wired to an in-process transport that records request bodies."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        return httpx.Response(
+            200,
+            json={
+                "id": "cmpl-1",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "test",
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+            },
+        )
+
+    return ChatOpenAI(model="test", api_key="key", base_url="http://vllm/v1", http_client=httpx.Client(transport=httpx.MockTransport(handler)))
+
+
+def test_draft_schema_is_sent_as_guided_json_with_length_limit() -> None:
+    requests: list[dict] = []
+    llm = _llm_with_reply('{"content": "Short tweet", "reasoning": "r"}', requests)
+
+    result = with_json_schema(llm, DraftOutput).invoke("write")
+
+    response_format = requests[0]["response_format"]
+    assert response_format["type"] == "json_schema"
+    assert response_format["json_schema"]["schema"]["properties"]["content"]["maxLength"] == settings.twitter_max_length
+    assert parse_result(result, PydanticOutputParser(pydantic_object=DraftOutput)).content == "Short tweet"
+    assert result["raw"].usage_metadata["input_tokens"] == 10  # noqa: PLR2004
+
+
+def test_editor_schema_bounds_index() -> None:
+    schema = _selection_schema(5).model_json_schema()
+
+    assert schema["properties"]["index"]["minimum"] == 0
+    assert schema["properties"]["index"]["maximum"] == 4  # noqa: PLR2004
+
+
+def test_parse_result_handles_free_form_and_errors() -> None:
+    parser = PydanticOutputParser(pydantic_object=EditorSelection)
+
+    assert parse_result(AIMessage(content='{"index": 1, "reasoning": "r"}'), parser).index == 1
+    with pytest.raises(ValueError, match="invalid"):
+        parse_result({"raw": AIMessage(content=""), "parsed": None, "parsing_error": ValueError("invalid")}, parser)
@@ -0,0 +1,51 @@
+import time
+from pathlib import Path
+
+import feedparser
+from pytest_mock import MockerFixture
+
+from src.content_agents.services.feed_cache import FeedCache
+from src.content_agents.services.news_fetcher import NewsFetcherService
+
+RSS = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Feed</title>
+  <item>
+    <title>Cached story</title>
+    <link>https://example.com/cached</link>
+    <description>Body</description>
+    <pubDate>Tue, 09 Dec 2025 10:00:00 +0000</pubDate>
+  </item>
+</channel></rss>"""
+
+
+def test_cache_roundtrip_restores_entries(tmp_path: Path) -> None:
+    cache = FeedCache(str(tmp_path))
+    entries = feedparser.parse(RSS).entries
+
+    cache.store("https://example.com/rss", entries, etag='"abc"', last_modified="Tue, 09 Dec 2025 10:00:00 GMT")
+    record = cache.get("https://example.com/rss")
+
+    assert FeedCache.conditional_headers(record) == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Tue, 09 Dec 2025 10:00:00 GMT",
+    }
+    restored = FeedCache.entries(record)
+    assert restored[0].title == "Cached story"
+    assert isinstance(restored[0].published_parsed, time.struct_time)
+    assert cache.get("https://example.com/other") is None
+
+
+def test_not_modified_feed_is_served_from_cache(tmp_path: Path, mocker: MockerFixture) -> None:
+    cache = FeedCache(str(tmp_path))
+    cache.store("https://example.com/rss", feedparser.parse(RSS).entries, etag='"abc"')
+
+    response = mocker.MagicMock(status_code=304)
+    response.__enter__.return_value = response
+    get = mocker.patch("src.content_agents.services.news_fetcher.requests.get", return_value=response)
+    parse = mocker.spy(feedparser, "parse")
+
+    entries = NewsFetcherService(feed_cache=cache)._download_feed("https://example.com/rss")
+
+    assert [e.link for e in entries] == ["https://example.com/cached"]
+    assert get.call_args.kwargs["headers"]["If-None-Match"] == '"abc"'
+    parse.assert_not_called()
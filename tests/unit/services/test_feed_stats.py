@@ -0,0 +1,79 @@
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import feedparser
+from pytest_mock import MockerFixture
+
+from src.content_agents.services.feed_cache import FeedCache
+from src.content_agents.services.feed_stats import FeedStats
+from src.content_agents.services.news_fetcher import NewsFetcherService
+
+HOUR = 3600.0
+NOW = datetime(2025, 1, 10, tzinfo=UTC)
+
+
+def _dates(count: int, every_hours: float) -> list[datetime]:
+    return [NOW - timedelta(hours=i * every_hours) for i in range(count)]
+
+
+def _stats(tmp_path: Path) -> FeedStats:
+    return FeedStats(str(tmp_path / "stats.json"), default_interval=HOUR, min_interval=600, max_interval=24 * HOUR)
+
+
+def test_poll_interval_follows_publishing_rate(tmp_path: Path) -> None:
+    stats = _stats(tmp_path)
+    now = NOW.timestamp()
+
+    busy = stats.record_success("busy", _dates(10, every_hours=2), now=now)
+    weekly = stats.record_success("weekly", _dates(5, every_hours=7 * 24), now=now)
+
+    assert busy == HOUR  # twice per 2h gap
+    assert weekly == 24 * HOUR  # capped at max_interval
+    assert stats.is_due("busy", now=now + busy)
+    assert not stats.is_due("busy", now=now + 60)
+
+
+def test_idle_and_failing_feeds_back_off(tmp_path: Path) -> None:
+    stats = _stats(tmp_path)
+    now = NOW.timestamp()
+    dates = _dates(10, every_hours=2)
+
+    first = stats.record_success("feed", dates, now=now)
+    idle = stats.record_success("feed", dates, now=now + first)  # nothing new
+    assert idle == 2 * first
+
+    fresh = stats.record_success("feed", [NOW + timedelta(hours=2), *dates], now=now + 2 * first)
+    assert fresh == first
+
+    assert stats.record_failure("down", now=now) == 600  # noqa: PLR2004
+    assert stats.record_failure("down", now=now) == 1200  # noqa: PLR2004
+
+
+def test_stats_persist_across_restarts(tmp_path: Path) -> None:
+    stats = _stats(tmp_path)
+    stats.record_success("feed", _dates(3, every_hours=1), now=NOW.timestamp())
+    stats.save()
+
+    assert _stats(tmp_path).get("feed") == stats.get("feed")
+
+
+def test_feed_not_due_is_served_from_cache(tmp_path: Path, mocker: MockerFixture) -> None:
+    published = datetime.now(UTC).strftime("%a, %d %b %Y %H:%M:%S +0000")
+    rss = f"""<?xml version="1.0"?><rss version="2.0"><channel><title>t</title>
+      <item><title>Cached story</title><link>https://example.com/1</link><pubDate>{published}</pubDate></item>
+    </channel></rss>"""
+    cache = FeedCache(str(tmp_path / "feeds"))
+    cache.store("feed", feedparser.parse(rss).entries)
+
+    stats = _stats(tmp_path)
+    service = NewsFetcherService(feed_cache=cache, feed_stats=stats)
+    download = mocker.patch.object(service, "_download_feed", return_value=feedparser.parse(rss).entries)
+    source = {"title": "T", "feed": "feed"}
+
+    service.fetch_sources([source])
+    assert download.call_count == 1
+    assert service.poll_interval(source) > 0
+
+    articles = service.fetch_sources([source])["feed"]
+    assert download.call_count == 1
+    assert [a.title for a in articles] == ["Cached story"]
@@ -0,0 +1,74 @@
+import json
+import time
+from pathlib import Path
+
+from src.content_agents.core.bloom import BloomFilter
+from src.content_agents.schemas.data_types import NewsArticle
+from src.content_agents.services.history import HistoryManager
+
+
+def test_add_and_lookup_persist_across_instances(tmp_path: Path) -> None:
+    db_path = str(tmp_path / "history.db")
+
+    history = HistoryManager(db_path, legacy_file=None)
+    history.add("https://example.com/a")
+    history.add("https://example.com/a")
+
+    reopened = HistoryManager(db_path, legacy_file=None)
+    assert reopened.is_processed("https://example.com/a")
+    assert not reopened.is_processed("https://example.com/b")
+
+
+def test_legacy_json_is_migrated_once(tmp_path: Path) -> None:
+    legacy = tmp_path / "history.json"
+    legacy.write_text(json.dumps({"urls": ["https://example.com/old"]}), encoding="utf-8")
+    db_path = str(tmp_path / "history.db")
+
+    history = HistoryManager(db_path, legacy_file=legacy)
+    assert history.is_processed("https://example.com/old")
+
+    # Changes to the legacy file after migration are ignored.
+    legacy.write_text(json.dumps({"urls": ["https://example.com/late"]}), encoding="utf-8")
+    reopened = HistoryManager(db_path, legacy_file=legacy)
+    assert not reopened.is_processed("https://example.com/late")
+
+
+def test_expired_entries_are_evicted(tmp_path: Path) -> None:
+    history = HistoryManager(str(tmp_path / "history.db"), legacy_file=None, retention_hours=1, bloom_capacity=100)
+    history.add("https://example.com/fresh")
+    history._conn.execute("INSERT INTO history (url, added_at) VALUES (?, ?)", ("https://example.com/stale", time.time() - 7200))
+
+    assert not history.is_processed("https://example.com/stale")
+
+    history._evict_expired(force=True)
+    count = history._conn.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+    assert count == 1
+    assert history.is_processed("https://example.com/fresh")
+
+
+def test_bloom_filter_has_no_false_negatives() -> None:
+    urls = [f"https://example.com/{i}" for i in range(1000)]
+    bloom = BloomFilter.from_items(urls, capacity=1000)
+
+    assert all(url in bloom for url in urls)
+    false_positives = sum(f"https://other.org/{i}" in bloom for i in range(1000))
+    assert false_positives < 50  # noqa: PLR2004
+
+
+def test_syndicated_copies_are_duplicates(tmp_path: Path) -> None:
+    history = HistoryManager(str(tmp_path / "history.db"), legacy_file=None, bloom_capacity=100)
+    body = (
+        "Anthropic announced a new model family with improved coding and agentic tool use across benchmarks. "
+        "The largest model leads on software engineering tasks, while the smallest targets low-latency use. "
+        "All models are available through the API and major cloud providers starting today."
+    )
+    published = NewsArticle(title="New models", content=body, url="https://a.com/post", source="A", published_at="2025-12-09")
+    history.add_article(published)
+
+    same_link = published.model_copy(update={"url": "http://www.a.com/post/?utm_source=rss"})
+    syndicated = published.model_copy(update={"url": "https://b.com/mirror", "content": body + " Via newsletter."})
+    other = published.model_copy(update={"url": "https://c.com/x", "title": "Chip export rules", "content": "Regulators tighten export limits."})
+
+    assert history.is_duplicate(same_link)
+    assert history.is_duplicate(syndicated)
+    assert not history.is_duplicate(other)
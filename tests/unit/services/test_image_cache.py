@@ -0,0 +1,86 @@
+import io
+import threading
+from pathlib import Path
+
+from PIL import Image
+from pytest_mock import MockerFixture
+
+from src.content_agents.services.image_cache import ImageCache
+
+
+def _png(size: tuple[int, int], mode: str = "RGB") -> bytes:
+    out = io.BytesIO()
+    Image.new(mode, size, color="red").save(out, format="PNG")
+    return out.getvalue()
+
+
+def test_large_image_is_downscaled_and_downloaded_once(tmp_path: Path, mocker: MockerFixture) -> None:
+    download = mocker.patch(
+        "src.content_agents.services.image_cache.download_image",
+        return_value=(_png((3000, 1500)), "image/png"),
+    )
+    cache = ImageCache(str(tmp_path), max_dimension=512)
+
+    first = cache.get_data_url("https://example.com/hero.png")
+    second = cache.get_data_url("https://example.com/hero.png")
+
+    assert first == second
+    assert first.startswith("data:image/jpeg;base64,")
+    download.assert_called_once()
+
+    data, _ = cache._lookup("https://example.com/hero.png")
+    assert Image.open(io.BytesIO(data)).size == (512, 256)
+
+
+def test_small_image_keeps_bytes_and_real_mime(tmp_path: Path, mocker: MockerFixture) -> None:
+    original = _png((100, 100), mode="RGBA")
+    mocker.patch("src.content_agents.services.image_cache.download_image", return_value=(original, "image/jpeg"))
+    cache = ImageCache(str(tmp_path))
+
+    data_url = cache.get_data_url("https://example.com/logo")
+
+    assert data_url.startswith("data:image/png;base64,")
+    assert cache._lookup("https://example.com/logo") == (original, "image/png")
+
+
+def test_least_recently_used_blobs_are_evicted(tmp_path: Path, mocker: MockerFixture) -> None:
+    images = {f"https://example.com/{i}": _png((200, 200 + i)) for i in range(3)}
+    mocker.patch(
+        "src.content_agents.services.image_cache.download_image",
+        side_effect=lambda url: (images[url], "image/png"),
+    )
+    blob_size = len(images["https://example.com/0"])
+    cache = ImageCache(str(tmp_path), max_bytes=int(blob_size * 2.5))
+
+    for url in images:
+        cache.get_data_url(url)
+
+    assert cache._lookup("https://example.com/0") is None
+    assert cache._lookup("https://example.com/2") is not None
+
+
+def test_get_data_url_joins_inflight_prefetch(tmp_path: Path, mocker: MockerFixture) -> None:
+    release = threading.Event()
+
+    def slow_download(url: str) -> tuple[bytes, str]:
+        release.wait(timeout=5)
+        return _png((10, 10)), "image/png"
+
+    download = mocker.patch("src.content_agents.services.image_cache.download_image", side_effect=slow_download)
+    cache = ImageCache(str(tmp_path))
+
+    cache.prefetch(["https://example.com/a", None, "https://example.com/a"])
+    release.set()
+    data_url = cache.get_data_url("https://example.com/a")
+
+    assert data_url.startswith("data:image/png;base64,")
+    download.assert_called_once()
+
+
+def test_missing_pillow_is_reported(tmp_path: Path, mocker: MockerFixture) -> None:
+    mocker.patch("src.content_agents.services.image_cache.Image", None)
+    warning = mocker.patch("src.content_agents.services.image_cache.logger.warning")
+
+    ImageCache(str(tmp_path))
+
+    warning.assert_called_once()
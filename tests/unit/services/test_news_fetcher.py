@@ -0,0 +1,124 @@
+import time
+from datetime import UTC, datetime, timedelta
+
+import feedparser
+from pytest_mock import MockerFixture
+
+from src.content_agents.services.news_fetcher import NewsFetcherService
+
+
+def _rss(title: str) -> str:
+    published = datetime.now(UTC).strftime("%a, %d %b %Y %H:%M:%S +0000")
+    return f"""<?xml version="1.0"?>
+    <rss version="2.0"><channel><title>{title}</title>
+      <item>
+        <title>{title} story</title>
+        <link>https://example.com/{title}</link>
+        <description>&lt;p&gt;Body of {title}&lt;/p&gt;</description>
+        <pubDate>{published}</pubDate>
+      </item>
+    </channel></rss>"""
+
+
+def test_rubric_fetch_is_concurrent_and_ordered(mocker: MockerFixture) -> None:
+    """Slow feeds overlap, but articles still come back in source order."""
+    delays = {"a": 0.3, "b": 0.1, "c": 0.2}
+
+    def fake_download(feed_url: str) -> list[feedparser.FeedParserDict]:
+        time.sleep(delays[feed_url])
+        return feedparser.parse(_rss(feed_url)).entries
+
+    service = NewsFetcherService(max_concurrency=3)
+    mocker.patch.object(service, "_download_feed", side_effect=fake_download)
+
+    rubric = {"rubric": "Test", "sources": [{"title": name.upper(), "feed": name} for name in delays]}
+
+    started = time.monotonic()
+    articles = service.fetch_news_from_rubric(rubric)
+    elapsed = time.monotonic() - started
+
+    assert [a.source for a in articles] == ["A", "B", "C"]
+    assert articles[0].content == "Body of a"
+    assert elapsed < sum(delays.values())
+
+
+def test_failing_feed_does_not_break_rubric(mocker: MockerFixture) -> None:
+    service = NewsFetcherService()
+
+    def fake_download(feed_url: str) -> list[feedparser.FeedParserDict]:
+        if feed_url == "broken":
+            raise TimeoutError("too slow")
+        return feedparser.parse(_rss(feed_url)).entries
+
+    mocker.patch.object(service, "_download_feed", side_effect=fake_download)
+
+    rubric = {"rubric": "Test", "sources": [{"title": "Broken", "feed": "broken"}, {"title": "Ok", "feed": "ok"}]}
+
+    articles = service.fetch_news_from_rubric(rubric)
+
+    assert [a.source for a in articles] == ["Ok"]
+
+
+def test_fetch_all_rubrics_downloads_shared_feeds_once(mocker: MockerFixture) -> None:
+    service = NewsFetcherService()
+    download = mocker.patch.object(
+        service,
+        "_download_feed",
+        side_effect=lambda feed_url: feedparser.parse(_rss(feed_url)).entries,
+    )
+
+    rubrics = [
+        {"rubric": "One", "sources": [{"title": "A", "feed": "a"}, {"title": "Shared", "feed": "shared"}]},
+        {"rubric": "Two", "sources": [{"title": "Shared", "feed": "shared"}]},
+    ]
+
+    index = service.fetch_all_rubrics(rubrics)
+
+    assert download.call_count == 2  # noqa: PLR2004
+    assert [a.source for a in index["One"]] == ["A", "Shared"]
+    assert [a.url for a in index["Two"]] == ["https://example.com/shared"]
+
+
+def test_parse_summary_extracts_text_and_first_image() -> None:
+    service = NewsFetcherService()
+
+    text, image = service._parse_summary(
+        '<p>GPUs &amp; TPUs</p><script>track()</script><img src="https://x/1.png"><img src="https://x/2.png"><p>Done</p>',
+    )
+    assert text == "GPUs & TPUs\nDone"
+    assert image == "https://x/1.png"
+
+    assert service._parse_summary("Plain &amp; simple") == ("Plain & simple", None)
+    assert service._parse_summary("") == ("", None)
+
+
+def test_entry_dates_prefer_feedparser_tuples(mocker: MockerFixture) -> None:
+    """Pre-parsed struct_time fields are used; dateutil only runs for dates feedparser could not parse."""
+    entries = feedparser.parse(_rss("fresh")).entries
+    entries[0]["published_parsed"] = None
+    entries[0]["published"] = datetime.now(UTC).strftime("%d.%m.%Y %H:%M")  # not RFC 822
+    entries += feedparser.parse(_rss("parsed")).entries
+
+    service = NewsFetcherService()
+    mocker.patch.object(service, "_download_feed", return_value=entries)
+    fallback = mocker.spy(NewsFetcherService, "_fallback_entry_date")
+
+    articles = service._fetch_source({"title": "T", "feed": "f"}, datetime.now(UTC))
+
+    assert [a.title for a in articles] == ["fresh story", "parsed story"]
+    assert fallback.call_count == 1
+
+
+def test_stale_feed_is_skipped_without_parsing(mocker: MockerFixture) -> None:
+    entries = feedparser.parse(_rss("old")).entries * 100
+
+    service = NewsFetcherService(time_window_hours=24)
+    mocker.patch.object(service, "_download_feed", return_value=entries)
+    parse_summary = mocker.spy(service, "_parse_summary")
+    fallback = mocker.spy(NewsFetcherService, "_fallback_entry_date")
+
+    articles = service._fetch_source({"title": "T", "feed": "f"}, datetime.now(UTC) + timedelta(days=2))
+
+    assert articles == []
+    assert parse_summary.call_count == 0
+    assert fallback.call_count == 0
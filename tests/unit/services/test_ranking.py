@@ -0,0 +1,83 @@
+from datetime import UTC, datetime, timedelta
+
+from pytest_mock import MockerFixture
+
+from src.content_agents.agents.editor import editor_node
+from src.content_agents.schemas.data_types import NewsArticle
+from src.content_agents.services.channel import Channel
+from src.content_agents.services.ranking import ArticleRanker, source_weights
+
+NOW = datetime(2025, 6, 1, 12, tzinfo=UTC)
+RELEASE_BODY = (
+    "Google released Gemma 3, a family of open multimodal models ranging from 1B to 27B parameters. "
+    "The models support a 128k context window, function calling and over 140 languages."
+)
+
+
+def _article(
+    title: str,
+    source: str = "Blog",
+    hours_old: float = 1.0,
+    content: str = "Some update.",
+    now: datetime = NOW,
+) -> NewsArticle:
+    return NewsArticle(
+        title=title,
+        content=content,
+        url=f"https://example.com/{title.lower().replace(' ', '-')}",
+        source=source,
+        published_at=(now - timedelta(hours=hours_old)).isoformat(),
+    )
+
+
+def test_ranker_prefers_recent_articles() -> None:
+    old = _article("Quarterly update", hours_old=30)
+    new = _article("Weekly update", hours_old=1)
+
+    assert ArticleRanker().rank([old, new], now=NOW) == [new, old]
+
+
+def test_ranker_uses_source_weights() -> None:
+    minor = _article("Team update", source="Aggregator")
+    major = _article("Team news", source="Lab Blog")
+    weights = source_weights([{"rubric": "AI", "sources": [{"title": "Lab Blog", "feed": "x", "weight": 3.0}]}])
+
+    assert ArticleRanker().rank([minor, major], weights, now=NOW)[0] is major
+
+
+def test_ranker_boosts_salient_and_widely_covered_stories() -> None:
+    fluff = _article("Five tips for your week")
+    release = _article("Google releases Gemma 3 open-weight models", content=RELEASE_BODY)
+    assert ArticleRanker().rank([fluff, release], now=NOW)[0] is release
+
+    story = _article("Lab ships a thing", source="A", content=RELEASE_BODY)
+    syndicated = _article("Lab ships a thing", source="B", content=RELEASE_BODY + " Read more.")
+    other = _article("Lab ships another thing", source="C", content="Unrelated short note about a meetup.")
+    ranker = ArticleRanker()
+
+    assert ranker._cluster_sizes([story, syndicated, other]) == [2, 2, 1]
+    assert ranker.rank([other, story, syndicated], now=NOW)[-1] is other
+
+
+def test_editor_falls_back_to_top_ranked_without_llm_answer(mocker: MockerFixture) -> None:
+    channel = Channel("ai", news=mocker.Mock(), history=mocker.Mock(), twitter=mocker.Mock())
+    channel.news.load_sources.return_value = []
+    mocker.patch("src.content_agents.agents.editor.settings.editor_max_candidates", 2)
+    llm = mocker.patch("src.content_agents.agents.editor.get_llm").return_value
+    mocker.patch("src.content_agents.agents.editor.with_json_schema", return_value=llm)
+    llm.invoke.side_effect = RuntimeError("vLLM is down")
+
+    articles = [_article(f"Update {i}", hours_old=10 - i, now=datetime.now(UTC)) for i in range(5)]
+    update = editor_node({"articles": articles}, {"configurable": {"channel": channel}})
+
+    assert update["selected_article"] is articles[-1]
+    shortlist = llm.invoke.call_args.args[0][1].content
+    assert "Update 4" in shortlist
+    assert "Update 0" not in shortlist
+
+
+def test_ranker_uses_cross_feed_cluster_size() -> None:
+    single = _article("Lab ships a thing", content="First note.")
+    popular = _article("Lab ships a tool", content="Second note.").model_copy(update={"cluster_size": 3})
+
+    assert ArticleRanker().rank([single, popular], now=NOW)[0] is popular
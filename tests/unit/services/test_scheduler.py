@@ -0,0 +1,53 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from pytest_mock import MockerFixture
+
+from src.content_agents.schemas.data_types import NewsArticle
+from src.content_agents.services.news_fetcher import NewsFetcherService
+from src.content_agents.services.scheduler import FeedScheduler
+
+RUBRICS = [
+    {"rubric": "Fast", "sources": [{"title": "F", "feed": "fast", "poll_minutes": 1}]},
+    {"rubric": "Slow", "sources": [{"title": "S", "feed": "slow", "poll_minutes": 60}]},
+]
+
+
+def _article(url: str, age_hours: float = 0) -> NewsArticle:
+    published = datetime.now(UTC) - timedelta(hours=age_hours)
+    return NewsArticle(title=url, content="", url=url, source="test", published_at=published.isoformat())
+
+
+@pytest.fixture
+def fetcher(mocker: MockerFixture) -> NewsFetcherService:
+    service = NewsFetcherService()
+    mocker.patch.object(service, "load_sources", return_value=RUBRICS)
+    mocker.patch.object(
+        service,
+        "fetch_sources",
+        side_effect=lambda sources: {s["feed"]: [_article(f"https://{s['feed']}/1"), _article("https://old", 48)] for s in sources},
+    )
+    return service
+
+
+async def test_feeds_are_polled_on_their_own_cadence(fetcher: NewsFetcherService, mocker: MockerFixture) -> None:
+    scheduler = FeedScheduler(fetcher, run_session=lambda _: None, publish_interval=3600)
+    clock = mocker.patch("src.content_agents.services.scheduler.time.monotonic", return_value=1000.0)
+
+    assert await scheduler.poll_due() == 2  # noqa: PLR2004
+
+    clock.return_value = 1000.0 + 120  # two minutes later only the fast feed is due
+    assert await scheduler.poll_due() == 1
+    assert [s["feed"] for s in fetcher.fetch_sources.call_args.args[0]] == ["fast"]
+
+
+async def test_ready_index_groups_by_rubric_and_drops_stale(fetcher: NewsFetcherService) -> None:
+    scheduler = FeedScheduler(fetcher, run_session=lambda _: None, publish_interval=3600)
+    await scheduler.poll_due()
+
+    index = scheduler.ready_index()
+
+    assert {name: [a.url for a in articles] for name, articles in index.items()} == {
+        "Fast": ["https://fast/1"],
+        "Slow": ["https://slow/1"],
+    }
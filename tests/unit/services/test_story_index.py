@@ -0,0 +1,49 @@
+from datetime import UTC, datetime, timedelta
+
+from src.content_agents.schemas.data_types import NewsArticle
+from src.content_agents.services.story_index import StoryIndex
+
+RELEASE_BODY = (
+    "Google released Gemma 3, a family of open multimodal models ranging from 1B to 27B parameters. "
+    "The models support a 128k context window, function calling and over 140 languages, "
+    "and the 27B variant fits on a single accelerator."
+)
+
+
+def _article(title: str, source: str, content: str, hours_old: float = 1.0) -> NewsArticle:
+    return NewsArticle(
+        title=title,
+        content=content,
+        url=f"https://{source.lower()}.example.com/{title.lower().replace(' ', '-')}",
+        source=source,
+        published_at=(datetime.now(UTC) - timedelta(hours=hours_old)).isoformat(),
+    )
+
+
+def test_merges_syndicated_copies_across_rubrics() -> None:
+    original = _article("Google releases Gemma 3", "Google", RELEASE_BODY, hours_old=3)
+    newsletter = _article("Gemma 3 is here", "Newsletter", "Big week. " + RELEASE_BODY + " Subscribe for more.")
+    aggregator = _article("Google releases Gemma 3", "Aggregator", RELEASE_BODY[:200])
+    other = _article("NVIDIA posts record earnings", "NVIDIA", "Data center revenue grew again this quarter.")
+
+    index = StoryIndex().merge_index({"Releases": [newsletter, other, original], "Digest": [aggregator]})
+
+    releases = index["Releases"]
+    assert [a.title for a in releases] == ["Google releases Gemma 3", "NVIDIA posts record earnings"]
+    assert releases[0].source == "Google"  # the earliest article represents the story
+    assert releases[0].cluster_size == 3  # noqa: PLR2004
+    assert set(releases[0].extra_sources) == {"Newsletter", "Aggregator"}
+    assert releases[1].cluster_size == 1
+    assert index["Digest"][0].cluster_size == 3  # noqa: PLR2004
+
+
+def test_indexes_incrementally_and_drops_aged_out_articles() -> None:
+    stories = StoryIndex(max_age_hours=24)
+    original = _article("Google releases Gemma 3", "Google", RELEASE_BODY, hours_old=30)
+    copy = _article("Google releases Gemma 3", "Aggregator", RELEASE_BODY)
+
+    stories.add([original, copy])
+    stories.add([copy])
+
+    assert len(stories) == 1
+    assert stories.merge([copy])[0].cluster_size == 1